@@ -1,22 +1,87 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-import openpyxl
-from io import BytesIO
-
-# Set page configuration
-st.set_page_config(
-    page_title="Airline Bids Analysis",
-    page_icon="✈️",
-    layout="wide",
-    initial_sidebar_state="expanded"
+
+from bid_data import (
+    BidFileError,
+    CACHE_DIR,
+    CACHE_MAX_MB,
+    DatasetKey,
+    DatasetRegistry,
+    EXPORT_FORMATS,
+    LoadJob,
+    ParsedFrameCache,
+    REVISION_REPORT_ROWS,
+    RouteIndex,
+    SCATTER_POINT_LIMIT,
+    STORE_IDLE_MINUTES,
+    STORE_MAX_MB,
+    WEEKS_PER_YEAR,
+    compare_revisions,
+    compute_carrier_stats,
+    compute_route_summary,
+    compute_savings_ranking,
+    content_digest,
+    downsample_points,
+    export_bytes,
+    filter_sort_rows,
+    format_route,
+    load_bid_files,
+    resolve_colors,
+    write_export,
 )
+from profiling import add_profile_records, profile_records, profile_stage, profiled, start_profiling
+
+# Profiling mode: per-stage timings for each rerun, optionally appended to a JSON lines log
+PROFILE_DEFAULT = os.environ.get('AIRLINE_DASHBOARD_PROFILE', '').lower() in ('1', 'true', 'yes')
+PROFILE_LOG = os.environ.get('AIRLINE_DASHBOARD_PROFILE_LOG')
+
+# Operators can list every session's datasets in the shared-datasets panel; by default each session sees its own
+STORE_ADMIN = os.environ.get('AIRLINE_DASHBOARD_STORE_ADMIN', '').lower() in ('1', 'true', 'yes')
+
+# Uploads are parsed on a background thread; loads that finish within LOAD_WAIT_SECONDS skip the progress
+# view, which polls every LOAD_POLL_SECONDS
+LOAD_WAIT_SECONDS = 0.5
+LOAD_POLL_SECONDS = 1.0
+
+# Cached chart figures per process; route charts are keyed by dataset and route
+FIGURE_CACHE_ENTRIES = 64
+
+# Coverage scatter modes: the top carriers as SVG, or the whole market as WebGL traces
+COVERAGE_MODES = {
+    'Top 15 carriers': 'top',
+    'All carriers (WebGL)': 'carriers',
+    'All bids (WebGL)': 'bids',
+}
+
+# Download formats; whole-dataset Excel exports are offered up to BULK_XLSX_MAX_ROWS, as openpyxl writes ~1,000 rows/s
+EXPORT_LABELS = {'csv': 'CSV', 'parquet': 'Parquet', 'xlsx': 'Excel (formatted)'}
+BULK_XLSX_MAX_ROWS = 50_000
+# Internal columns left out of whole-dataset exports
+BULK_EXPORT_EXCLUDED = ('color', 'route_id')
+
+# Coverage bands the all-carriers scatter samples within once it passes SCATTER_POINT_LIMIT
+COVERAGE_BANDS = 50
+
+# Page sizes offered by paginated tables
+PAGE_SIZES = [10, 25, 50, 100]
+
+# Columns shown by default in the route detail table; the rest can be switched on
+ROUTE_DETAIL_COLUMNS = [
+    'route', 'airline', 'min_charge2', 'rating', 'rating_category', 'direct_indirect', 'via',
+    'commodity_group', 'air_mode', 'currency', 'source_file',
+]
 
 # Custom CSS for professional styling
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.8rem;
@@ -77,120 +142,412 @@ st.markdown("""
         font-weight: 600;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def configure_page():
+    """Set page configuration and inject the custom CSS"""
+    st.set_page_config(
+        page_title="Airline Bids Analysis",
+        page_icon="✈️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_frame_cache():
+    """Process-wide parsed frame cache shared by all sessions"""
+    return ParsedFrameCache(CACHE_DIR, CACHE_MAX_MB * 1024 * 1024)
+
+@st.cache_resource
+def get_dataset_registry():
+    """Loaded datasets shared by all sessions, so viewers of the same upload reference one in-memory copy"""
+    return DatasetRegistry(STORE_MAX_MB * 1024 * 1024, STORE_IDLE_MINUTES * 60)
+
+def get_session_id():
+    """Stable id of this browser session, used to count a dataset's readers"""
+    return st.session_state.setdefault('session_id', uuid.uuid4().hex)
+
+def show_load_error(dataset_key, message=None):
+    """Show, and with a message remember, why dataset_key failed to load so it isn't re-parsed on every rerun"""
+    errors = st.session_state.setdefault('load_errors', {})
+    if message is not None:
+        errors[dataset_key] = message
+    if dataset_key in errors:
+        st.error(errors[dataset_key])
+        return True
+    return False
+
+@st.cache_resource
+def get_load_jobs():
+    """Background loads by dataset key, shared by all sessions so the same upload is parsed once"""
+    return {}, threading.Lock()
+
+def prune_load_jobs(jobs):
+    """Drop finished loads left uncollected for STORE_IDLE_MINUTES; call with the jobs lock held"""
+    cutoff = time.time() - STORE_IDLE_MINUTES * 60
+    for key in [key for key, job in jobs.items() if job.finished is not None and job.finished < cutoff]:
+        del jobs[key]
 
-@st.cache_data
-def load_data(uploaded_file):
-    """Load and process the Excel file data"""
+def start_load_job(dataset_key, uploaded_files):
+    """The background load of dataset_key, running or awaiting collection, or None when it is already loaded
+    
+    A new load is started unless the dataset is loaded or some session's load of it is running or uncollected.
+    The job puts the frame straight into the dataset registry, so it falls under the store's size cap and idle
+    eviction even when the session that uploaded it closes before collecting it; an uncollected job keeps only
+    its error and stage timings.
+    """
+    jobs, lock = get_load_jobs()
+    with lock:
+        prune_load_jobs(jobs)
+        job = jobs.get(dataset_key)
+        if job is None and dataset_key not in get_dataset_registry():
+            sources = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+            job = jobs[dataset_key] = LoadJob(
+                sources, get_frame_cache(), dataset_key.digest, on_done=partial(get_dataset_registry().put, dataset_key)
+            )
+    return job
+
+def finish_load_job(dataset_key):
+    """Drop a finished background load once this session has collected its frame or error"""
+    jobs, lock = get_load_jobs()
+    with lock:
+        job = jobs.get(dataset_key)
+        if job is not None and not job.running:
+            del jobs[dataset_key]
+        prune_load_jobs(jobs)
+
+@st.fragment(run_every=LOAD_POLL_SECONDS)
+def show_load_progress(job):
+    """Progress of a background load, refreshed on its own until the load finishes and the app reruns"""
+    if not job.running:
+        st.rerun()
+    
+    if job.stage == 'parsing':
+        text = f"🔄 Parsing bid sheet: {job.done:,} rows read"
+        if job.total:
+            text += f" of about {job.total:,}"
+    elif job.stage == 'parsing files':
+        text = f"🔄 Parsing files: {job.done} of {job.total} done"
+    else:
+        text = f"🔄 Processing bid data: {job.stage}"
+    text += f" · {job.elapsed:.0f}s"
+    
+    st.progress(min(job.done / job.total, 1.0) if job.total else 0.0, text=text)
+
+@profiled('load_data')
+def load_data(dataset_key, uploaded_files, job=None):
+    """Load and process the uploaded Excel files into one dataset, reporting the error of a failed background load"""
+    # The shared registry hands every session the same frame instead of a per-session unpickled copy
+    registry = get_dataset_registry()
+    entry = registry.get(dataset_key, get_session_id())
+    if entry is not None:
+        return entry.df
+    if show_load_error(dataset_key):
+        return None
+    
     try:
-        workbook = openpyxl.load_workbook(uploaded_file, data_only=True)
-        
-        if 'Airline Bids' not in workbook.sheetnames:
-            st.error("Sheet 'Airline Bids' not found in the Excel file")
-            return None
-        
-        sheet = workbook['Airline Bids']
-        
-        # Convert to DataFrame starting from row 11 (data starts there)
-        data = []
-        headers = []
-        
-        # Get headers from row 10
-        for col in range(3, sheet.max_column + 1):
-            cell = sheet.cell(row=11, column=col)
-            headers.append(cell.value if cell.value else f'col_{col}')
-        
-        # Get data starting from row 12
-        for row in range(12, sheet.max_row + 1):
-            row_data = []
-            for col in range(3, sheet.max_column + 1):
-                cell = sheet.cell(row=row, column=col)
-                row_data.append(cell.value)
-            
-            # Only add rows that have data in key columns
-            if row_data[3] and row_data[4] and row_data[13]:  # Origin Airport, Destination Airport, Airline
-                data.append(row_data)
-        
-        # Create DataFrame
-        df = pd.DataFrame(data, columns=headers)
-        
-        # Clean and standardize column names
-        column_mapping = {
-            'Commodity Group': 'commodity_group',
-            'TempControlled': 'temp_controlled',
-            'Air Mode': 'air_mode',
-            'Origin Airport': 'origin_airport',
-            'Destination Airport': 'destination_airport',
-            'Origin Country': 'origin_country',
-            'Destinatin Country': 'destination_country',
-            'Origin Region': 'origin_region',
-            'Destination Region': 'destination_region',
-            'Airline': 'airline',
-            'Intention to Bid (Yes/No)': 'intention_to_bid',
-            'Direct / Indirect': 'direct_indirect',
-            'Via': 'via',
-            'Currency': 'currency',
-            'Min Charge': 'min_charge',
-            'Min Charge2': 'min_charge2',
-            'Percentage': 'percentage',
-            'Numerical Rating': 'rating',
-            'Column1': 'rating_category'  # This contains Green/Orange/Red
-        }
-        
-        # Rename columns that exist in the DataFrame
-        for old_name, new_name in column_mapping.items():
-            if old_name in df.columns:
-                df = df.rename(columns={old_name: new_name})
-        
-        # Convert numeric columns
-        numeric_columns = ['min_charge2', 'rating']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Create route column
-        df['route'] = df['origin_airport'] + ' → ' + df['destination_airport']
-        
-        # Create color mapping based on BOTH numerical rating AND rating_category
-        def get_color_from_data(row):
-            # First try to use rating_category (Green/Red/Orange)
-            if pd.notna(row.get('rating_category')) and str(row.get('rating_category')).strip() != 'None':
-                category = str(row.get('rating_category')).strip().lower()
-                if category == 'green':
-                    return '#22c55e'  # Bright Green
-                elif category == 'orange':
-                    return '#f97316'  # Bright Orange  
-                elif category == 'red':
-                    return '#ef4444'  # Bright Red
-            
-            # If rating_category is not available, use numerical rating
-            rating = row.get('rating')
-            if pd.notna(rating):
-                if rating == 1:
-                    return '#22c55e'  # Bright Green
-                elif rating == 2:
-                    return '#f97316'  # Bright Orange
-                elif rating == 3:
-                    return '#ef4444'  # Bright Red
-            
-            return '#6b7280'  # Gray for unknown
-        
-        df['color'] = df.apply(get_color_from_data, axis=1)
-        
-        # Clean rating category
-        if 'rating_category' in df.columns:
-            df['rating_category'] = df['rating_category'].astype(str).str.strip()
-            df['rating_category'] = df['rating_category'].replace({'nan': 'Unknown', '': 'Unknown'})
-        
-        # Filter out rows with missing critical data
-        df = df.dropna(subset=['origin_airport', 'destination_airport', 'airline', 'min_charge2'])
-        
-        return df
-        
+        if job is not None and job.error is not None:
+            raise job.error
+        # A finished job has already put its frame in the registry; this loads again only if it was evicted since,
+        # which the frame cache makes cheap
+        sources = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+        df = load_bid_files(sources, get_frame_cache(), dataset_key.digest)
+    
+    except BidFileError as e:
+        show_load_error(dataset_key, str(e))
+        return None
+    
     except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
+        show_load_error(dataset_key, f"Error loading data: {str(e)}")
+        return None
+    
+    return registry.put(dataset_key, df, reader=get_session_id()).df
+
+def get_previous_frame(previous_key):
+    """The previous dataset's frame from the registry or the frame cache, or None when it is in neither"""
+    previous_entry = get_dataset_registry().get(previous_key)
+    if previous_entry is not None:
+        return previous_entry.df
+    return get_frame_cache().get(previous_key.digest)
+
+@st.cache_data(max_entries=8)
+def get_revision_changes(dataset_key, previous_key, _df):
+    """Change counts and changed bids since the previous dataset, or None when it is no longer loaded or cached
+    
+    Keyed by both datasets, so a session that reaches this upload from another previous dataset gets its own report.
+    """
+    previous = get_previous_frame(previous_key)
+    if previous is None:
         return None
+    return compare_revisions(previous, _df)
+
+def get_dataset_key(uploaded_files):
+    """Cache key for a set of uploads, hashing each file once per upload instead of on every rerun"""
+    known_digests = st.session_state.get('file_digests', {})
+    file_digests = {
+        uploaded_file.file_id: known_digests.get(uploaded_file.file_id)
+        or content_digest(uploaded_file.getvalue())
+        for uploaded_file in uploaded_files
+    }
+    st.session_state['file_digests'] = file_digests
+    
+    if len(uploaded_files) == 1:
+        digest = next(iter(file_digests.values()))
+    else:
+        # Upload order doesn't change the dataset
+        digest = content_digest(''.join(sorted(file_digests.values())).encode())
+    
+    return DatasetKey(
+        ', '.join(sorted(uploaded_file.name for uploaded_file in uploaded_files)),
+        sum(uploaded_file.size for uploaded_file in uploaded_files),
+        digest
+    )
+
+def get_previous_dataset(dataset_key):
+    """Key of the dataset loaded before this one in the session, the base of the change report"""
+    loaded_key = st.session_state.get('loaded_dataset')
+    if loaded_key is not None and loaded_key != dataset_key:
+        st.session_state['previous_dataset'] = loaded_key
+    return st.session_state.get('previous_dataset')
+
+@st.cache_resource(max_entries=8)
+def get_route_index(dataset_key, _df):
+    """Route index for a loaded dataset, shared across reruns and sessions"""
+    return RouteIndex(_df)
+
+@st.cache_data(max_entries=8)
+def get_carrier_stats(dataset_key, _df):
+    """Carrier statistics for a loaded dataset, computed once rather than on every tab switch"""
+    return compute_carrier_stats(_df)
+
+def show_ingest_report(df):
+    """Show per-file parse times and any files that were skipped"""
+    reports = df.attrs.get('ingest_report')
+    if not reports:
+        return
+    
+    for report in reports:
+        if report['error']:
+            st.warning(f"⚠️ Skipped {report['file']}: {report['error']}")
+    
+    if len(reports) > 1:
+        with st.expander(f"📂 Loaded {len(reports)} files"):
+            st.dataframe(
+                pd.DataFrame({
+                    'File': [report['file'] for report in reports],
+                    'Format': [report['format'] for report in reports],
+                    'Bids': [report['rows'] for report in reports],
+                    'Empty Rows Skipped': [report.get('phantom_rows', 0) for report in reports],
+                    'Parse Time (s)': [round(report['seconds'], 2) for report in reports],
+                    'Status': ['Skipped' if report['error'] else 'Loaded' for report in reports],
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+
+@st.cache_data(max_entries=8)
+def get_route_summary(dataset_key, _df):
+    """Per-route statistics for a loaded dataset, shared by the route metric cards and the all routes table"""
+    return compute_route_summary(_df)
 
+@st.cache_data(max_entries=8)
+def get_savings_ranking(dataset_key, _route_summary):
+    """Network-wide savings ranking for a loaded dataset, derived from its route summary"""
+    return compute_savings_ranking(_route_summary)
+
+def show_revision_report(revision, previous_key):
+    """Summarize what changed since the previously loaded dataset"""
+    if revision is None:
+        return
+    report, changes = revision
+    
+    st.info(
+        f"🔁 Compared with {previous_key.name}: {report['changed']:,} changed, {report['added']:,} added and "
+        f"{report['removed']:,} removed bids ({report['unchanged']:,} unchanged)."
+    )
+    if changes.empty:
+        return
+    
+    with st.expander("🔁 Changed bids"):
+        st.dataframe(
+            changes.rename(columns={
+                'change': 'Change',
+                'airline': 'Airline',
+                'origin_airport': 'Origin',
+                'destination_airport': 'Destination',
+                'commodity_group': 'Commodity Group',
+                'air_mode': 'Air Mode',
+                'previous_rate': 'Previous Rate',
+                'new_rate': 'New Rate',
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        if len(changes) < report['changed'] + report['added'] + report['removed']:
+            st.caption(f"Showing up to {REVISION_REPORT_ROWS:,} bids of each kind of change")
+
+def show_memory_report(df):
+    """Show how much memory dtype compaction saved for the loaded dataset"""
+    report = df.attrs.get('memory_report')
+    if not report:
+        return
+    
+    before_mb = report['before_bytes'] / 1024 / 1024
+    after_mb = report['after_bytes'] / 1024 / 1024
+    
+    st.sidebar.markdown("### 🧮 Memory Footprint")
+    st.sidebar.metric(
+        "Dataset Size",
+        f"{after_mb:.1f} MB",
+        delta=f"-{before_mb - after_mb:.1f} MB vs {before_mb:.1f} MB",
+        delta_color="inverse"
+    )
+    with st.sidebar.expander("Compacted columns"):
+        st.dataframe(
+            pd.DataFrame(
+                [(col, old, new) for col, (old, new) in report['columns'].items()],
+                columns=['Column', 'Before', 'After']
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+
+def show_cache_status(lookup_ms=None):
+    """Show parsed file cache statistics in the sidebar"""
+    frame_cache = get_frame_cache()
+    
+    st.sidebar.markdown("### 🗄️ Parsed File Cache")
+    col1, col2 = st.sidebar.columns(2)
+    col1.metric("Hits", frame_cache.hits)
+    col2.metric("Misses", frame_cache.misses)
+    st.sidebar.caption(
+        f"{frame_cache.size_bytes() / 1024 / 1024:.1f} MB of {CACHE_MAX_MB} MB used"
+    )
+    if lookup_ms is not None:
+        st.sidebar.caption(f"⏱️ Dataset lookup this rerun: {lookup_ms:.1f} ms")
+
+def show_store_status():
+    """Show the shared datasets this session reads (all of them for operators), their footprint and readers"""
+    registry = get_dataset_registry()
+    # Other analysts' file names and activity are not shown to ordinary sessions
+    usage = registry.usage(None if STORE_ADMIN else get_session_id())
+    if not usage:
+        return
+    
+    st.sidebar.markdown("### 🗃️ Shared Datasets")
+    st.sidebar.dataframe(
+        pd.DataFrame({
+            'Dataset': [item['key'].name for item in usage],
+            'Rows': [item['rows'] for item in usage],
+            'MB': [round(item['bytes'] / 1024 / 1024, 1) for item in usage],
+            'Sessions': [item['readers'] for item in usage],
+            'Idle (min)': [round(item['idle_seconds'] / 60, 1) for item in usage],
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    if STORE_ADMIN:
+        st.sidebar.caption(
+            f"{sum(item['bytes'] for item in usage) / 1024 / 1024:.1f} MB of {STORE_MAX_MB} MB used; "
+            f"datasets idle for {STORE_IDLE_MINUTES:g} minutes are released"
+        )
+    else:
+        st.sidebar.caption(
+            f"Shared with other sessions viewing the same upload; released after {STORE_IDLE_MINUTES:g} idle minutes"
+        )
+
+def show_profile_panel(dataset_key=None):
+    """Render the per-stage latency breakdown for this rerun and log it for APM"""
+    records = [record for record in profile_records() if record['ms'] is not None]
+    if not records:
+        return
+    
+    entry = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'dataset': dataset_key._asdict() if dataset_key is not None else None,
+        'stages': records,
+    }
+    payload = json.dumps(entry)
+    if PROFILE_LOG:
+        with open(PROFILE_LOG, 'a') as log_file:
+            log_file.write(payload + '\n')
+    
+    st.sidebar.markdown("### ⏱️ Stage Timings")
+    timings = pd.DataFrame({
+        'Stage': ['\u2003' * record['depth'] + record['stage'] for record in records],
+        'Time (ms)': [round(record['ms'], 1) for record in records],
+    })
+    st.sidebar.dataframe(timings, use_container_width=True, hide_index=True)
+    total_ms = sum(record['ms'] for record in records if record['depth'] == 0)
+    st.sidebar.caption(f"Instrumented total: {total_ms:.1f} ms")
+    st.sidebar.download_button(
+        label="📥 Download Timings (JSON)",
+        data=payload,
+        file_name="stage_timings.json",
+        mime="application/json"
+    )
+
+def paginated_table(df, key, default_columns=None, formatters=None, sort_by=None, ascending=True):
+    """Table filtered, sorted and paged on the server, so only the visible page and columns reach the browser
+    
+    formatters maps column names to format strings, applied to the visible page only.
+    """
+    formatters = formatters or {}
+    columns = list(df.columns)
+    
+    with st.expander("🧩 Columns"):
+        visible = st.multiselect(
+            "Visible columns",
+            columns,
+            default=[col for col in default_columns or columns if col in columns],
+            key=f'{key}_columns'
+        )
+    visible = visible or columns
+    
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input("🔎 Filter rows", key=f'{key}_query', placeholder="Text to match in any visible column")
+    with col2:
+        sort_options = [None] + columns
+        sort_column = st.selectbox(
+            "Sort by",
+            sort_options,
+            index=sort_options.index(sort_by) if sort_by in columns else 0,
+            format_func=lambda col: 'Original order' if col is None else col,
+            key=f'{key}_sort'
+        )
+    with col3:
+        ascending = st.toggle("Ascending", value=ascending, key=f'{key}_ascending')
+    with col4:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f'{key}_page_size')
+    
+    with profile_stage(f'{key} filter & sort'):
+        rows = filter_sort_rows(df, query, sort_column, ascending, columns=visible)
+    
+    # The page input sits under the table; read its value first and keep it in range as filters change
+    page_key = f'{key}_page'
+    pages = max(1, -(-len(rows) // page_size))
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    first = (st.session_state.get(page_key, 1) - 1) * page_size
+    
+    page = rows.iloc[first:first + page_size][visible]
+    for col, fmt in formatters.items():
+        if col in page.columns:
+            page[col] = page[col].map(fmt.format)
+    
+    with profile_stage(f'{key} table'):
+        st.dataframe(page, use_container_width=True, hide_index=True)
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    with col2:
+        filtered = f" (filtered from {len(df):,})" if query else ""
+        st.caption(f"Rows {min(first + 1, len(rows)):,}–{first + len(page):,} of {len(rows):,}{filtered} · page size {page_size}")
+
+@profiled('show_executive_overview')
 def show_executive_overview(df):
     """Show executive summary of the data"""
     st.markdown('<h1 class="main-header">✈️ Airline Bids Analysis Dashboard</h1>', unsafe_allow_html=True)
@@ -212,12 +569,12 @@ def show_executive_overview(df):
     """, unsafe_allow_html=True)
     
     # Only show metrics if data is available
-    if not df.empty and 'route' in df.columns:
+    if not df.empty and 'route_id' in df.columns:
         # Key Metrics with explanations
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_routes = df['route'].nunique()
+            total_routes = df['route_id'].nunique()
             st.markdown(f"""
             <div class="metric-card">
             <h4 style="color: #1e40af; margin: 0;">🌍 Global Routes</h4>
@@ -270,67 +627,10 @@ def show_executive_overview(df):
         </div>
         """, unsafe_allow_html=True)
 
-def create_route_analysis(df, origin, destination):
-    """Create detailed analysis for a specific route"""
-    route_data = df[(df['origin_airport'] == origin) & (df['destination_airport'] == destination)].copy()
-    
-    if route_data.empty:
-        st.warning("⚠️ No carriers serve this route in our current bid data.")
-        return None
-    
-    route_name = f"{origin} → {destination}"
-    
-    # Route Performance Metrics
-    st.markdown(f'<div class="section-header">📍 Route Analysis: {route_name}</div>', unsafe_allow_html=True)
-    
-    # Brief explanation for route metrics
-    st.markdown("""
-    <div style="background-color: #f8fafc; padding: 1rem; border-radius: 6px; margin: 1rem 0;">
-    <p style="margin: 0; color: #374151;"><strong>Route Metrics:</strong> Compare carrier options and identify cost-saving opportunities for this specific shipping lane.</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        carrier_count = route_data['airline'].nunique()
-        st.metric("🏢 Carriers Available", carrier_count)
-    
-    with col2:
-        best_price = route_data['min_charge2'].min()
-        st.metric("💰 Best Rate", f"${best_price:.2f}")
-    
-    with col3:
-        avg_price = route_data['min_charge2'].mean()
-        st.metric("📊 Market Average", f"${avg_price:.2f}")
-    
-    with col4:
-        if len(route_data) > 1:
-            price_variance = route_data['min_charge2'].max() - route_data['min_charge2'].min()
-            st.metric("📈 Price Spread", f"${price_variance:.2f}")
-        else:
-            st.metric("📈 Price Spread", "$0.00")
-    
-    # Carrier Comparison Chart
-    st.markdown("### 🏆 Carrier Competitiveness Analysis")
-    
-    # Sort by price for better visualization
-    route_data = route_data.sort_values('min_charge2')
-    
-    # Force color assignment based on what we see in the data
-    def assign_colors_manually(row):
-        # Use rating_category if available
-        if pd.notna(row['rating_category']) and str(row['rating_category']).strip().lower() in ['green', 'red', 'orange']:
-            category = str(row['rating_category']).strip().lower()
-            if category == 'green':
-                return '#22c55e'
-            elif category == 'orange': 
-                return '#f97316'
-            elif category == 'red':
-                return '#ef4444'
-        return '#6b7280'
-    
-    route_data['display_color'] = route_data.apply(assign_colors_manually, axis=1)
+def build_route_figure(route_data, route_name):
+    """Bar chart of a route's bids by carrier, colored by rating category"""
+    # Plotly is imported on first use so the landing page doesn't pay for it
+    import plotly.graph_objects as go
     
     # Create professional chart with FORCED COLORS
     fig = go.Figure()
@@ -379,6 +679,64 @@ def create_route_analysis(df, origin, destination):
         ),
         margin=dict(t=60, b=60, l=60, r=60)
     )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_route_figure(dataset_key, route_id, _route_data, route_name):
+    """Route chart, built once per dataset and route
+    
+    The Figure itself is cached: st.plotly_chart serializes a Figure as is but re-validates a plain dict.
+    """
+    return build_route_figure(_route_data, route_name)
+
+@profiled('create_route_analysis')
+def create_route_analysis(df, dataset_key, route_index, route_summary, origin, destination):
+    """Create detailed analysis for a specific route"""
+    with profile_stage('route filtering'):
+        route_data = route_index.with_labels(route_index.route_rows(df, origin, destination))
+    
+    if route_data.empty:
+        st.warning("⚠️ No carriers serve this route in our current bid data.")
+        return None
+    
+    route_name = format_route(origin, destination)
+    
+    # Route Performance Metrics
+    st.markdown(f'<div class="section-header">📍 Route Analysis: {route_name}</div>', unsafe_allow_html=True)
+    
+    # Brief explanation for route metrics
+    st.markdown("""
+    <div style="background-color: #f8fafc; padding: 1rem; border-radius: 6px; margin: 1rem 0;">
+    <p style="margin: 0; color: #374151;"><strong>Route Metrics:</strong> Compare carrier options and identify cost-saving opportunities for this specific shipping lane.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    stats = route_summary.loc[route_index.route_ids[(origin, destination)]]
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("🏢 Carriers Available", int(stats['carriers']))
+    
+    with col2:
+        st.metric("💰 Best Rate", f"${stats['best_rate']:.2f}")
+    
+    with col3:
+        st.metric("📊 Market Average", f"${stats['avg_rate']:.2f}")
+    
+    with col4:
+        st.metric("📈 Price Spread", f"${stats['price_spread']:.2f}")
+    
+    # Carrier Comparison Chart
+    st.markdown("### 🏆 Carrier Competitiveness Analysis")
+    
+    # Sort by price for better visualization
+    route_data = route_data.sort_values('min_charge2')
+    
+    # Force color assignment based on what we see in the data
+    route_data['display_color'] = resolve_colors(route_data, use_rating=False)
+    
+    with profile_stage('route chart build'):
+        fig = get_route_figure(dataset_key, route_index.route_ids[(origin, destination)], route_data, route_name)
     
     st.plotly_chart(fig, use_container_width=True)
     
@@ -396,6 +754,7 @@ def create_route_analysis(df, origin, destination):
     
     return route_data
 
+@profiled('show_carrier_insights')
 def show_carrier_insights(route_data, route_name):
     """Show detailed carrier insights and recommendations"""
     
@@ -432,7 +791,7 @@ def show_carrier_insights(route_data, route_name):
             <p><strong>Potential Savings:</strong> ${savings:.2f}</p>
             <p><strong>Savings Percentage:</strong> {savings_pct:.1f}%</p>
             <p><strong>vs. Highest Bidder:</strong> {worst_option['airline']}</p>
-            <p><strong>Annual Impact:</strong> ${savings * 52:.0f} (weekly shipments)</p>
+            <p><strong>Annual Impact:</strong> ${savings * WEEKS_PER_YEAR:.0f} (weekly shipments)</p>
             </div>
             """, unsafe_allow_html=True)
     
@@ -473,90 +832,297 @@ def show_carrier_insights(route_data, route_name):
         return ['background-color: #f9fafb'] * len(row)
     
     styled_df = display_df.style.apply(highlight_ratings, axis=1)
-    st.dataframe(styled_df, use_container_width=True, hide_index=True)
+    with profile_stage('carrier comparison table'):
+        st.dataframe(styled_df, use_container_width=True, hide_index=True)
 
-def create_airlines_overview(df):
-    """Create comprehensive airlines performance overview"""
-    st.markdown('<div class="section-header">🏢 Carrier Performance Dashboard</div>', unsafe_allow_html=True)
+@profiled('show_savings_ranking')
+def show_savings_ranking(ranking, route_index):
+    """Every route ranked by potential savings, one page at a time"""
+    st.markdown("### 💰 Savings Opportunities")
+    
+    if ranking.empty:
+        st.info("No route has competing bids yet, so there are no savings from switching carriers.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Routes with Savings", f"{int((ranking['savings'] > 0).sum()):,}")
+    with col2:
+        st.metric("Weekly Savings (all routes)", f"${ranking['savings'].sum():,.0f}")
+    with col3:
+        st.metric("Annual Impact (all routes)", f"${ranking['annual_impact'].sum():,.0f}")
     
-    # Calculate airline statistics step by step to avoid confusion
-    avg_rates = df.groupby('airline')['min_charge2'].mean().round(2)
-    routes_covered = df.groupby('airline')['route'].nunique()
-    total_bids = df.groupby('airline').size()  # Count rows per airline
-    
-    # Combine into one dataframe
-    airline_stats = pd.DataFrame({
-        'airline': avg_rates.index,
-        'avg_rate': avg_rates.values,
-        'routes_covered': routes_covered.values,
-        'total_bids': total_bids.values
+    # Built from numbers; the component formats only the visible page
+    display_ranking = pd.DataFrame({
+        'Rank': range(1, len(ranking) + 1),
+        'Route': route_index.labels.reindex(ranking.index).to_numpy(),
+        'Potential Savings': ranking['savings'].to_numpy(),
+        'Savings %': ranking['savings_pct'].to_numpy(),
+        'Annual Impact': ranking['annual_impact'].to_numpy(),
+        'Best Carrier': ranking['best_airline'].to_numpy(),
+        'Best Rate': ranking['best_rate'].to_numpy(),
+        'Highest Bidder': ranking['worst_airline'].to_numpy(),
+        'Highest Rate': ranking['max_rate'].to_numpy(),
+        'Carriers': ranking['carriers'].to_numpy(),
     })
+    paginated_table(
+        display_ranking,
+        'savings_ranking',
+        formatters={
+            'Potential Savings': '${:,.2f}',
+            'Savings %': '{:.1f}%',
+            'Annual Impact': '${:,.0f}',
+            'Best Rate': '${:.2f}',
+            'Highest Rate': '${:.2f}',
+        }
+    )
+    st.caption(f"{len(ranking):,} routes with competing bids, ranked by potential savings")
+
+@profiled('show_all_routes')
+def show_all_routes(route_summary, route_index):
+    """Sortable overview of every route from the precomputed route summary"""
+    st.markdown('<div class="section-header">🗺️ All Routes Overview</div>', unsafe_allow_html=True)
+    
+    display_routes = pd.DataFrame({
+        'Route': route_index.labels.reindex(route_summary.index).to_numpy(),
+        'Carriers': route_summary['carriers'].to_numpy(),
+        'Total Bids': route_summary['total_bids'].to_numpy(),
+        'Best Rate': route_summary['best_rate'].to_numpy(),
+        'Best Carrier': route_summary['best_airline'].to_numpy(),
+        'Average Rate': route_summary['avg_rate'].to_numpy(),
+        'Highest Rate': route_summary['max_rate'].to_numpy(),
+        'Price Spread': route_summary['price_spread'].to_numpy(),
+        '🟢 Green': route_summary['green_bids'].to_numpy(),
+        '🟠 Orange': route_summary['orange_bids'].to_numpy(),
+        '🔴 Red': route_summary['red_bids'].to_numpy(),
+    })
+    paginated_table(
+        display_routes,
+        'all_routes',
+        formatters={col: '${:.2f}' for col in ['Best Rate', 'Average Rate', 'Highest Rate', 'Price Spread']},
+        sort_by='Price Spread',
+        ascending=False
+    )
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES)
+def get_route_export(dataset_key, route_id, file_format, _route_data):
+    """Route download payload, built on the first click and reused per dataset, route and format"""
+    return export_bytes(_route_data, file_format)
+
+@st.cache_resource(max_entries=4)
+def get_bulk_export(dataset_key, query, file_format, _df):
+    """Whole-dataset export written chunk by chunk to a temporary file, deleted once it leaves the cache"""
+    handle = tempfile.NamedTemporaryFile(suffix=EXPORT_FORMATS[file_format][1])
+    columns = [col for col in _df.columns if col not in BULK_EXPORT_EXCLUDED]
+    write_export(_df, handle, file_format, query=query, columns=columns)
+    handle.flush()
+    return handle
+
+def show_route_export(dataset_key, route_id, route_data, origin, destination):
+    """Download buttons for one route; payloads are generated only when a button is clicked"""
+    st.markdown("#### 📥 Download Route Analysis")
+    for col, (file_format, (mime, extension)) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+        with col:
+            st.download_button(
+                label=EXPORT_LABELS[file_format],
+                data=partial(get_route_export, dataset_key, route_id, file_format, route_data),
+                file_name=f"route_analysis_{origin}_{destination}{extension}",
+                mime=mime,
+                on_click='ignore',
+                key=f'route_export_{file_format}'
+            )
+
+def show_bulk_export(df, dataset_key):
+    """Export of every bid, optionally only those matching a text filter"""
+    with st.expander("📦 Export all bids"):
+        formats = [fmt for fmt in EXPORT_FORMATS if fmt != 'xlsx' or len(df) <= BULK_XLSX_MAX_ROWS]
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            query = st.text_input(
+                "Only bids containing", key='bulk_export_query', placeholder="Carrier, airport, commodity…"
+            )
+        with col2:
+            file_format = st.selectbox(
+                "Format", formats, format_func=EXPORT_LABELS.get, key='bulk_export_format',
+                help=f"Excel is offered for datasets of up to {BULK_XLSX_MAX_ROWS:,} bids"
+            )
+        
+        mime, extension = EXPORT_FORMATS[file_format]
+        suffix = f"_{query.strip().replace(' ', '_')}" if query.strip() else ''
+        st.download_button(
+            label="📥 Download",
+            data=lambda: Path(get_bulk_export(dataset_key, query.strip(), file_format, df).name).read_bytes(),
+            file_name=f"airline_bids{suffix}{extension}",
+            mime=mime,
+            on_click='ignore',
+            key='bulk_export_download'
+        )
+        st.caption("The file is written in chunks when you click Download, so large exports may take a moment.")
+
+def build_coverage_figure(airline_stats, mode='top', df=None, route_index=None):
+    """Market coverage vs pricing scatter
     
-    # Sort by total bids
-    airline_stats = airline_stats.sort_values('total_bids', ascending=False)
+    'top' draws the 15 busiest carriers as SVG bubbles; 'carriers' draws every carrier and 'bids'
+    every bid against its carrier's coverage, both as WebGL traces and downsampled past
+    SCATTER_POINT_LIMIT. Returns the figure and the number of points drawn out of the total.
+    """
+    import plotly.express as px
+    
+    labels = {
+        'routes_covered': 'Routes Covered',
+        'avg_rate': 'Average Rate (USD)',
+        'total_bids': 'Total Bids',
+        'min_charge2': 'Rate (USD)',
+    }
+    
+    if mode == 'bids':
+        import plotly.graph_objects as go
+        
+        points = downsample_points(df[['airline', 'route_id', 'min_charge2', 'color']])
+        coverage = airline_stats.astype({'airline': str}).set_index('airline')['routes_covered']
+        points = pd.DataFrame({
+            'routes_covered': coverage.reindex(points['airline'].astype(str)).to_numpy(),
+            'min_charge2': points['min_charge2'].to_numpy(),
+            'color': points['color'].astype(str).to_numpy(),
+            'airline': points['airline'].astype(str).to_numpy(),
+            'route': route_index.labels.reindex(points['route_id']).to_numpy(),
+        })
+        
+        # One trace per rating color: a per-point color list costs Plotly a validation per point
+        fig = go.Figure()
+        for color, group in points.groupby('color', sort=False):
+            fig.add_trace(go.Scattergl(
+                x=group['routes_covered'].to_numpy(),
+                y=group['min_charge2'].to_numpy(),
+                mode='markers',
+                marker=dict(color=color, size=5, opacity=0.6),
+                customdata=group[['airline', 'route']].to_numpy(),
+                hovertemplate="<b>%{customdata[0]}</b><br>%{customdata[1]}<br>Rate: $%{y:.2f}<extra></extra>",
+                showlegend=False
+            ))
+        fig.update_layout(
+            title="Market Coverage vs Bid Pricing (every bid)",
+            xaxis_title=labels['routes_covered'],
+            yaxis_title=labels['min_charge2'],
+        )
+        total = len(df)
+    else:
+        if mode == 'top':
+            points = airline_stats.head(15)
+        else:
+            # Each carrier is one row, so sample within coverage bands, keeping every band's cheapest and dearest carrier
+            bands = pd.cut(airline_stats['routes_covered'], bins=COVERAGE_BANDS, labels=False)
+            points = downsample_points(airline_stats.assign(coverage_band=bands), by='coverage_band', value='avg_rate')
+        fig = px.scatter(
+            points,
+            x='routes_covered',
+            y='avg_rate',
+            size='total_bids',
+            hover_name='airline',
+            title="Market Coverage vs Average Pricing",
+            labels=labels,
+            render_mode='svg' if mode == 'top' else 'webgl'
+        )
+        total = len(airline_stats)
+    
+    fig.update_layout(
+        height=400,
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig, len(points), total
+
+def build_top_carriers_figure(airline_stats):
+    """Most active carriers bar chart"""
+    import plotly.express as px
+    
+    # Top carriers by total bids
+    top_carriers = airline_stats.nlargest(10, 'total_bids')
+    
+    fig = px.bar(
+        top_carriers,
+        x='airline',
+        y='total_bids',
+        title='Most Active Carriers (Total Bids)',
+        labels={'total_bids': 'Total Bids', 'airline': 'Carriers'}
+    )
+    fig.update_layout(
+        height=400,
+        showlegend=False,
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_coverage_figure(dataset_key, mode, _airline_stats, _df=None, _route_index=None):
+    """Coverage scatter, built once per dataset and mode rather than re-running Plotly on every rerun"""
+    return build_coverage_figure(_airline_stats, mode, _df, _route_index)
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_top_carriers_figure(dataset_key, _airline_stats):
+    return build_top_carriers_figure(_airline_stats)
+
+@profiled('create_airlines_overview')
+def create_airlines_overview(dataset_key, airline_stats, df, route_index):
+    """Create comprehensive airlines performance overview"""
+    st.markdown('<div class="section-header">🏢 Carrier Performance Dashboard</div>', unsafe_allow_html=True)
     
     # Performance Summary Table
     st.markdown("### 📊 Carrier Performance Summary")
     
-    # Format for executive presentation
-    display_stats = airline_stats.copy()
-    display_stats['avg_rate'] = display_stats['avg_rate'].apply(lambda x: f"${x:.2f}")
-    
     # Professional column names
-    display_stats = display_stats.rename(columns={
+    display_stats = airline_stats.rename(columns={
         'airline': 'Carrier',
         'routes_covered': 'Routes Covered',
         'total_bids': 'Total Bids',
-        'avg_rate': 'Average Rate'
+        'avg_rate': 'Average Rate',
+        'min_rate': 'Best Rate',
+        'median_rate': 'Median Rate',
+        'max_rate': 'Highest Rate',
+        'green_bids': '🟢 Green',
+        'orange_bids': '🟠 Orange',
+        'red_bids': '🔴 Red'
     })
     
-    # Show the 4 columns in correct order
-    display_stats = display_stats[['Carrier', 'Routes Covered', 'Total Bids', 'Average Rate']]
+    # Show the columns in correct order
+    display_stats = display_stats[[
+        'Carrier', 'Routes Covered', 'Total Bids', 'Average Rate', 'Best Rate', 'Median Rate',
+        'Highest Rate', '🟢 Green', '🟠 Orange', '🔴 Red'
+    ]]
     
-    st.dataframe(display_stats, use_container_width=True, hide_index=True)
+    paginated_table(
+        display_stats,
+        'carrier_summary',
+        formatters={col: '${:.2f}' for col in ['Average Rate', 'Best Rate', 'Median Rate', 'Highest Rate']}
+    )
     
     # Performance Analysis Charts
+    scatter_mode = st.radio(
+        "Coverage chart",
+        list(COVERAGE_MODES),
+        horizontal=True,
+        key='coverage_mode',
+        help="The WebGL modes draw the whole market; past "
+             f"{SCATTER_POINT_LIMIT:,} points a fixed sample is drawn that keeps the price extremes "
+             "(per carrier for bids, per coverage band for carriers)"
+    )
+    mode = COVERAGE_MODES[scatter_mode]
+    with profile_stage('carrier charts build'):
+        fig1, shown, total = get_coverage_figure(
+            dataset_key, mode, airline_stats, df if mode == 'bids' else None, route_index if mode == 'bids' else None
+        )
+        fig2 = get_top_carriers_figure(dataset_key, airline_stats)
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        # Market Coverage vs Pricing
-        fig1 = px.scatter(
-            airline_stats.head(15),
-            x='routes_covered',
-            y='avg_rate',
-            size='total_bids',
-            hover_name='airline',
-            title="Market Coverage vs Average Pricing",
-            labels={
-                'routes_covered': 'Routes Covered',
-                'avg_rate': 'Average Rate (USD)',
-                'total_bids': 'Total Bids'
-            }
-        )
-        fig1.update_layout(
-            height=400,
-            plot_bgcolor='white',
-            paper_bgcolor='white'
-        )
         st.plotly_chart(fig1, use_container_width=True)
+        if shown < total:
+            unit = 'bids' if mode == 'bids' else 'carriers'
+            st.caption(f"Showing {shown:,} of {total:,} {unit}" + (" (downsampled)" if mode != 'top' else ""))
     
     with col2:
-        # Top carriers by total bids
-        top_carriers = airline_stats.nlargest(10, 'total_bids')
-        
-        fig2 = px.bar(
-            top_carriers,
-            x='airline',
-            y='total_bids',
-            title='Most Active Carriers (Total Bids)',
-            labels={'total_bids': 'Total Bids', 'airline': 'Carriers'}
-        )
-        fig2.update_layout(
-            height=400,
-            showlegend=False,
-            plot_bgcolor='white',
-            paper_bgcolor='white'
-        )
         st.plotly_chart(fig2, use_container_width=True)
     
     # Market Insights
@@ -570,24 +1136,71 @@ def create_airlines_overview(df):
     """, unsafe_allow_html=True)
 
 def main():
+    configure_page()
+    
+    profiling = st.sidebar.toggle(
+        "⏱️ Profiling mode",
+        value=PROFILE_DEFAULT,
+        help="Time each stage of the rerun (parse, cleaning, route filtering, charts, tables)"
+    )
+    start_profiling(profiling)
+    
+    incremental = st.sidebar.toggle(
+        "🔁 Compare with previous upload",
+        value=False,
+        help="When a new revision of the bid files is uploaded, report which bids changed, were added or "
+             "were withdrawn since the previously loaded dataset. The upload loads as usual; the comparison adds "
+             "a fraction of a second"
+    )
+    
     # File upload
-    uploaded_file = st.file_uploader(
-        "📁 Upload Airline Bids Excel File",
-        type=['xlsx', 'xls'],
-        help="Select the Excel file containing the 'Airline Bids' sheet"
+    uploaded_files = st.file_uploader(
+        "📁 Upload Airline Bids Files",
+        type=['xlsx', 'xls', 'csv', 'parquet'],
+        accept_multiple_files=True,
+        help="Select one or more Excel files containing the 'Airline Bids' sheet, or CSV/Parquet exports "
+             "of the same table; regional files are combined"
     )
     
-    if uploaded_file is not None:
+    lookup_ms = None
+    dataset_key = None
+    df = None
+    loading = False
+    
+    if uploaded_files:
         # Load data
-        with st.spinner("🔄 Processing bid data..."):
-            df = load_data(uploaded_file)
+        start = time.perf_counter()
+        dataset_key = get_dataset_key(uploaded_files)
+        previous_key = get_previous_dataset(dataset_key)
+        revision = None
+        # New uploads parse on a background thread, so the page stays live and shows progress meanwhile
+        job = None
+        if dataset_key not in st.session_state.get('load_errors', {}):
+            job = start_load_job(dataset_key, uploaded_files)
+            loading = job is not None and not job.wait(LOAD_WAIT_SECONDS)
+        if loading:
+            show_load_progress(job)
+        else:
+            if job is not None:
+                # The load's stages ran on its own thread; count them in the rerun that collects it
+                add_profile_records(job.profile)
+            df = load_data(dataset_key, uploaded_files, job)
+            finish_load_job(dataset_key)
+            if df is not None and incremental and previous_key is not None:
+                revision = get_revision_changes(dataset_key, previous_key, df)
+        lookup_ms = (time.perf_counter() - start) * 1000
         
         if df is not None:
+            st.session_state['loaded_dataset'] = dataset_key
+            show_revision_report(revision, previous_key)
+            show_ingest_report(df)
+            show_memory_report(df)
+            
             # Show executive overview
             show_executive_overview(df)
             
             # Create main navigation tabs
-            tab1, tab2 = st.tabs(["🎯 Route Analysis", "🏢 Carrier Performance"])
+            tab1, tab2, tab3 = st.tabs(["🎯 Route Analysis", "🏢 Carrier Performance", "🗺️ All Routes"])
             
             with tab1:
                 st.markdown('<div class="section-header">🛫 Route-Specific Analysis</div>', unsafe_allow_html=True)
@@ -600,7 +1213,11 @@ def main():
                 """, unsafe_allow_html=True)
                 
                 # Airport selection
-                origins = sorted(df['origin_airport'].unique())
+                with profile_stage('route index'):
+                    route_index = get_route_index(dataset_key, df)
+                with profile_stage('route summary'):
+                    route_summary = get_route_summary(dataset_key, df)
+                origins = route_index.origins
                 
                 col1, col2 = st.columns(2)
                 
@@ -613,8 +1230,7 @@ def main():
                 
                 with col2:
                     # Filter destinations based on origin
-                    available_destinations = df[df['origin_airport'] == selected_origin]['destination_airport'].unique()
-                    available_destinations = sorted(available_destinations)
+                    available_destinations = route_index.destinations_for(selected_origin)
                     
                     selected_destination = st.selectbox(
                         "🛬 Destination Airport",
@@ -624,33 +1240,44 @@ def main():
                 
                 # Route analysis
                 if selected_origin and selected_destination:
-                    route_data = create_route_analysis(df, selected_origin, selected_destination)
+                    route_data = create_route_analysis(
+                        df, dataset_key, route_index, route_summary, selected_origin, selected_destination
+                    )
                     
                     if route_data is not None and not route_data.empty:
                         # Analysis tabs
                         sub_tab1, sub_tab2 = st.tabs(["📊 Overview", "📋 Detailed Analysis"])
                         
                         with sub_tab1:
-                            route_name = f"{selected_origin} → {selected_destination}"
+                            route_name = format_route(selected_origin, selected_destination)
                             show_carrier_insights(route_data, route_name)
                         
                         with sub_tab2:
                             st.markdown("### 🔍 Comprehensive Route Data")
-                            st.dataframe(route_data, use_container_width=True)
+                            paginated_table(route_data, 'route_detail', default_columns=ROUTE_DETAIL_COLUMNS)
                             
-                            # Download option
-                            csv = route_data.to_csv(index=False)
-                            st.download_button(
-                                label="📥 Download Route Analysis",
-                                data=csv,
-                                file_name=f"route_analysis_{selected_origin}_{selected_destination}.csv",
-                                mime="text/csv"
+                            # Download options
+                            show_route_export(
+                                dataset_key,
+                                route_index.route_ids[(selected_origin, selected_destination)],
+                                route_data,
+                                selected_origin,
+                                selected_destination
                             )
             
             with tab2:
-                create_airlines_overview(df)
+                with profile_stage('carrier aggregation'):
+                    airline_stats = get_carrier_stats(dataset_key, df)
+                create_airlines_overview(dataset_key, airline_stats, df, route_index)
+            
+            with tab3:
+                with profile_stage('savings ranking'):
+                    savings_ranking = get_savings_ranking(dataset_key, route_summary)
+                show_savings_ranking(savings_ranking, route_index)
+                show_all_routes(route_summary, route_index)
+                show_bulk_export(df, dataset_key)
     
-    else:
+    if not uploaded_files or loading:
         # Professional landing page - create empty dataframe
         empty_df = pd.DataFrame()
         show_executive_overview(empty_df)
@@ -668,6 +1295,12 @@ def main():
         </ul>
         </div>
         """, unsafe_allow_html=True)
+    
+    show_cache_status(lookup_ms)
+    show_store_status()
+    
+    if profiling:
+        show_profile_panel(dataset_key)
 
 if __name__ == "__main__":
     main()
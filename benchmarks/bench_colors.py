@@ -0,0 +1,93 @@
+"""Check parity and time the row-wise color mapping against resolve_colors
+
+Usage: python benchmarks/bench_colors.py [--rows 200000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bid_data import resolve_colors  # noqa: E402
+
+def get_color_from_data(row):
+    """The original load_data color mapping"""
+    if pd.notna(row.get('rating_category')) and str(row.get('rating_category')).strip() != 'None':
+        category = str(row.get('rating_category')).strip().lower()
+        if category == 'green':
+            return '#22c55e'
+        elif category == 'orange':
+            return '#f97316'
+        elif category == 'red':
+            return '#ef4444'
+    
+    rating = row.get('rating')
+    if pd.notna(rating):
+        if rating == 1:
+            return '#22c55e'
+        elif rating == 2:
+            return '#f97316'
+        elif rating == 3:
+            return '#ef4444'
+    
+    return '#6b7280'
+
+def assign_colors_manually(row):
+    """The original create_route_analysis color mapping"""
+    if pd.notna(row['rating_category']) and str(row['rating_category']).strip().lower() in ['green', 'red', 'orange']:
+        category = str(row['rating_category']).strip().lower()
+        if category == 'green':
+            return '#22c55e'
+        elif category == 'orange':
+            return '#f97316'
+        elif category == 'red':
+            return '#ef4444'
+    return '#6b7280'
+
+def sample_frame(n_rows, seed=0):
+    """Ratings and categories covering every branch, including messy spellings and gaps"""
+    rng = np.random.default_rng(seed)
+    categories = np.array(
+        ['Green', 'Orange', 'Red', ' green ', 'RED', 'Unknown', 'None', '', 'nan', None, np.nan, 2],
+        dtype=object,
+    )
+    ratings = np.array([1, 2, 3, 4, 0, np.nan])
+    return pd.DataFrame({
+        'rating_category': rng.choice(categories, n_rows),
+        'rating': rng.choice(ratings, n_rows),
+    })
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    df = sample_frame(args.rows)
+    cases = [
+        ('load_data', lambda: df.apply(get_color_from_data, axis=1), lambda: resolve_colors(df)),
+        ('route', lambda: df.apply(assign_colors_manually, axis=1),
+         lambda: resolve_colors(df, use_rating=False)),
+    ]
+    
+    print(f"{'stage':<10} {'row-wise (s)':>13} {'vectorized (s)':>15} {'speedup':>9}")
+    for name, row_wise, vectorized in cases:
+        assert row_wise().tolist() == vectorized().tolist(), f"{name} colors differ"
+        old_time = best_time(row_wise, args.repeat)
+        new_time = best_time(vectorized, args.repeat)
+        print(f"{name:<10} {old_time:>13.3f} {new_time:>15.3f} {old_time / new_time:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
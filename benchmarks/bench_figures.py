@@ -0,0 +1,61 @@
+"""Chart cost per rerun: building the Plotly figures vs serializing a cached Figure, for every coverage mode
+
+Usage: python benchmarks/bench_figures.py [--rows 200000] [--repeat 20]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The dashboard's caches warn once per decorator when imported outside `streamlit run`
+logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+from airline_dashboard import build_coverage_figure, build_route_figure, build_top_carriers_figure  # noqa: E402
+from bid_data import RouteIndex, clean_bid_data, compute_carrier_stats, resolve_colors  # noqa: E402
+from synthetic import bid_frame  # noqa: E402
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def serialize(figures):
+    # What st.plotly_chart does with a Figure it is handed
+    for fig in figures:
+        fig.to_dict()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    df = clean_bid_data(bid_frame(args.rows))
+    airline_stats = compute_carrier_stats(df)
+    route_index = RouteIndex(df)
+    busiest = max(route_index.route_positions, key=lambda route_id: len(route_index.route_positions[route_id]))
+    route_data = df.iloc[route_index.route_positions[busiest]].sort_values('min_charge2')
+    route_data = route_data.assign(display_color=resolve_colors(route_data, use_rating=False))
+    route_name = route_index.labels[busiest]
+    
+    print(f"{'chart':<20} {'points':>9} {'build (ms)':>11} {'cached (ms)':>12}")
+    for label, build in (
+        ('route', lambda: (build_route_figure(route_data, route_name), len(route_data))),
+        ('top carriers', lambda: (build_top_carriers_figure(airline_stats), 10)),
+        ('coverage, top 15', lambda: build_coverage_figure(airline_stats, 'top')[:2]),
+        ('coverage, carriers', lambda: build_coverage_figure(airline_stats, 'carriers')[:2]),
+        ('coverage, bids', lambda: build_coverage_figure(airline_stats, 'bids', df, route_index)[:2]),
+    ):
+        figure, points = build()
+        print(f"{label:<20} {points:>9,} {median_ms(lambda: serialize([build()[0]]), args.repeat):>11.1f} "
+              f"{median_ms(lambda: serialize([figure]), args.repeat):>12.1f}")
+
+if __name__ == '__main__':
+    main()
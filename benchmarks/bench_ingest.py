@@ -0,0 +1,78 @@
+"""Time the legacy cell-by-cell parse against the streaming read-only parse
+
+Usage: python benchmarks/bench_ingest.py [--sizes 10000 100000 500000] [--legacy-max 100000]
+                                         [--phantom-rows 0] [--phantom-columns 0]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bid_data import read_bid_sheet  # noqa: E402
+from synthetic import write_bid_workbook  # noqa: E402
+
+def legacy_read_bid_sheet(source):
+    """The original load_data parse: normal-mode workbook walked with sheet.cell()"""
+    workbook = openpyxl.load_workbook(source, data_only=True)
+    sheet = workbook['Airline Bids']
+    
+    headers = []
+    for col in range(3, sheet.max_column + 1):
+        cell = sheet.cell(row=11, column=col)
+        headers.append(cell.value if cell.value else f'col_{col}')
+    
+    data = []
+    for row in range(12, sheet.max_row + 1):
+        row_data = []
+        for col in range(3, sheet.max_column + 1):
+            cell = sheet.cell(row=row, column=col)
+            row_data.append(cell.value)
+        if row_data[3] and row_data[4] and row_data[13]:
+            data.append(row_data)
+    
+    return pd.DataFrame(data, columns=headers)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--legacy-max', type=int, default=None,
+                        help='skip the legacy path above this many rows')
+    parser.add_argument('--phantom-rows', type=int, default=0,
+                        help='formatted empty rows below the data')
+    parser.add_argument('--phantom-columns', type=int, default=0,
+                        help='formatted empty columns right of the data')
+    args = parser.parse_args()
+    
+    print(f"{'rows':>10} {'legacy (s)':>12} {'streaming (s)':>14} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.sizes:
+            path = write_bid_workbook(
+                os.path.join(tmp, f'bids_{n_rows}.xlsx'), n_rows,
+                phantom_rows=args.phantom_rows, phantom_columns=args.phantom_columns
+            )
+            
+            new_df, new_time = timed(read_bid_sheet, path)
+            assert len(new_df) == n_rows
+            
+            if args.legacy_max is not None and n_rows > args.legacy_max:
+                print(f"{n_rows:>10,} {'skipped':>12} {new_time:>14.2f} {'-':>9}")
+                continue
+            
+            old_df, old_time = timed(legacy_read_bid_sheet, path)
+            # The legacy parse keeps empty trailing columns as col_N; the streaming parse drops them
+            pd.testing.assert_frame_equal(old_df[new_df.columns], new_df, check_dtype=False)
+            print(f"{n_rows:>10,} {old_time:>12.2f} {new_time:>14.2f} {old_time / new_time:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Cost of the revision change report: loading a new bid revision vs comparing it with the previous one
+
+Usage: python benchmarks/bench_revision.py [--rows 500000] [--changes 300] [--carriers 2]
+"""
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bid_data import compare_revisions, load_bid_files  # noqa: E402
+from synthetic import bid_frame, revise_bid_frame  # noqa: E402
+
+def parquet_bytes(raw):
+    buffer = BytesIO()
+    raw.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--changes', type=int, default=300,
+                        help='re-priced, withdrawn and new bids each')
+    parser.add_argument('--carriers', type=int, default=2,
+                        help='carriers whose bids change; 0 spreads the changes over all of them')
+    args = parser.parse_args()
+    
+    raw = bid_frame(args.rows)
+    carriers = sorted(raw['Airline'].unique())[:args.carriers] if args.carriers else None
+    revised = revise_bid_frame(raw, args.changes, airlines=carriers)
+    previous = load_bid_files([('round1.parquet', parquet_bytes(raw))])
+    revision_source = parquet_bytes(revised)
+    
+    start = time.perf_counter()
+    current = load_bid_files([('round2.parquet', revision_source)])
+    load_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    report, changes = compare_revisions(previous, current)
+    compare_time = time.perf_counter() - start
+    
+    # Withdrawn bids that share a key with later ones shift the pairing, so more than --changes can show as changed
+    assert report['unchanged'] + report['changed'] + report['added'] == len(current)
+    assert report['unchanged'] + report['changed'] + report['removed'] == len(previous)
+    assert report['changed'] >= args.changes
+    assert set(changes['change']) == {'Changed', 'Added', 'Removed'}
+    
+    print(f"changed {report['changed']:,}, added {report['added']:,}, removed {report['removed']:,}")
+    print(f"{'rows':>10} {'changes':>8} {'load (s)':>9} {'compare (s)':>12} {'overhead':>9}")
+    print(f"{args.rows:>10,} {args.changes:>8,} {load_time:>9.2f} {compare_time:>12.2f} "
+          f"{compare_time / load_time:>8.0%}")
+
+if __name__ == '__main__':
+    main()
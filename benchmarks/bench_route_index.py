@@ -0,0 +1,60 @@
+"""Per-interaction route selection latency: full-frame scans vs the precomputed RouteIndex
+
+Usage: python benchmarks/bench_route_index.py [--rows 1000000] [--interactions 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bid_data import RouteIndex, clean_bid_data  # noqa: E402
+from synthetic import bid_frame  # noqa: E402
+
+def full_scan(df, origin, destination):
+    """What main and create_route_analysis did on every rerun"""
+    sorted(df['origin_airport'].unique())
+    sorted(df[df['origin_airport'] == origin]['destination_airport'].unique())
+    return df[(df['origin_airport'] == origin) & (df['destination_airport'] == destination)].copy()
+
+def indexed(df, route_index, origin, destination):
+    route_index.destinations_for(origin)
+    return route_index.route_rows(df, origin, destination).copy()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--interactions', type=int, default=50)
+    args = parser.parse_args()
+    
+    df = clean_bid_data(bid_frame(args.rows))
+    
+    start = time.perf_counter()
+    route_index = RouteIndex(df)
+    build_time = time.perf_counter() - start
+    
+    rng = random.Random(0)
+    routes = [rng.choice(list(route_index.route_ids)) for _ in range(args.interactions)]
+    
+    timings = {}
+    for name, select in (
+        ('full scan', lambda o, d: full_scan(df, o, d)),
+        ('route index', lambda o, d: indexed(df, route_index, o, d)),
+    ):
+        start = time.perf_counter()
+        for origin, destination in routes:
+            select(origin, destination)
+        timings[name] = (time.perf_counter() - start) / len(routes) * 1000
+    
+    origin, destination = routes[0]
+    assert full_scan(df, origin, destination).equals(indexed(df, route_index, origin, destination))
+    
+    print(f"{len(df):,} rows, {len(route_index.route_ids):,} routes, index built in {build_time:.2f}s")
+    for name, ms in timings.items():
+        print(f"{name:<12} {ms:>8.2f} ms per interaction")
+    print(f"speedup      {timings['full scan'] / timings['route index']:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
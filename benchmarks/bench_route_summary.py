@@ -0,0 +1,62 @@
+"""All-routes statistics: one metrics pass per route vs the single-groupby route summary and savings ranking
+
+Usage: python benchmarks/bench_route_summary.py [--rows 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bid_data import RouteIndex, clean_bid_data, compute_route_summary, compute_savings_ranking  # noqa: E402
+from synthetic import bid_frame  # noqa: E402
+
+def per_route(df, route_index):
+    """What the route metric cards computed, repeated for every route"""
+    rows = {}
+    for (origin, destination), route_id in route_index.route_ids.items():
+        route_data = route_index.route_rows(df, origin, destination)
+        rates = route_data['min_charge2']
+        rows[route_id] = {
+            'carriers': route_data['airline'].nunique(),
+            'best_rate': rates.min(),
+            'avg_rate': rates.mean(),
+            'price_spread': rates.max() - rates.min() if len(route_data) > 1 else 0.0,
+            'best_airline': route_data['airline'].iloc[rates.to_numpy().argmin()],
+            'worst_airline': route_data['airline'].iloc[rates.to_numpy().argmax()],
+        }
+    return pd.DataFrame.from_dict(rows, orient='index').sort_index()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    df = clean_bid_data(bid_frame(args.rows))
+    route_index = RouteIndex(df)
+    
+    start = time.perf_counter()
+    expected = per_route(df, route_index)
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    route_summary = compute_route_summary(df)
+    summary_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    compute_savings_ranking(route_summary).head(25)
+    ranking_time = time.perf_counter() - start
+    
+    pd.testing.assert_frame_equal(
+        expected, route_summary[expected.columns], check_dtype=False, check_index_type=False, check_names=False
+    )
+    print(f"{'rows':>10} {'routes':>7} {'per route (s)':>14} {'summary (s)':>12} {'speedup':>8}")
+    print(f"{args.rows:>10,} {len(route_summary):>7,} {loop_time:>14.2f} {summary_time:>12.2f} "
+          f"{loop_time / summary_time:>7.1f}x")
+    print(f"savings ranking from the summary: {ranking_time * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Cold-start import cost of the dashboard and data layer, measured with python -X importtime
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 1500] [--output startup.json]
+
+Exits non-zero when a module goes over --budget-ms or eagerly imports a
+dependency that is meant to load lazily, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just by importing each entry point
+LAZY_MODULES = {
+    'airline_dashboard': ['plotly.express', 'openpyxl'],
+    'bid_data': ['streamlit', 'plotly', 'openpyxl'],
+}
+
+def import_profile(module):
+    """Run one cold interpreter and return {module name: (self us, cumulative us)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+def profile_module(module, runs, top):
+    profiles = [import_profile(module) for _ in range(runs)]
+    
+    # The fastest run is the least disturbed by the rest of the machine
+    best = min(profiles, key=lambda timings: timings[module][1])
+    heaviest = sorted(
+        ((name, cumulative / 1000) for name, (_, cumulative) in best.items() if name != module),
+        key=lambda item: item[1], reverse=True,
+    )[:top]
+    
+    return {
+        'module': module,
+        'cumulative_ms': best[module][1] / 1000,
+        'runs_ms': [timings[module][1] / 1000 for timings in profiles],
+        'heaviest_imports_ms': dict(heaviest),
+        'eager_lazy_modules': [name for name in LAZY_MODULES.get(module, []) if name in best],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', nargs='+', default=list(LAZY_MODULES))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, help='fail when a module takes longer than this to import')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+    
+    results = [profile_module(module, args.runs, args.top) for module in args.modules]
+    payload = json.dumps({'python': sys.version.split()[0], 'results': results}, indent=2)
+    
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(payload + '\n')
+    else:
+        print(payload)
+    
+    failures = []
+    for result in results:
+        if result['eager_lazy_modules']:
+            failures.append(f"{result['module']} eagerly imports {', '.join(result['eager_lazy_modules'])}")
+        if args.budget_ms is not None and result['cumulative_ms'] > args.budget_ms:
+            failures.append(f"{result['module']} took {result['cumulative_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Browser payload and server time of a paginated table vs sending the whole frame
+
+Usage: python benchmarks/bench_table_payload.py [--rows 1000000] [--page-size 25]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bid_data import RouteIndex, clean_bid_data, compact_dtypes, filter_sort_rows  # noqa: E402
+from synthetic import bid_frame  # noqa: E402
+
+def arrow_bytes(df):
+    """Size of the Arrow IPC stream st.dataframe sends for df"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--page-size', type=int, default=25)
+    args = parser.parse_args()
+    
+    df = compact_dtypes(clean_bid_data(bid_frame(args.rows)))
+    route_index = RouteIndex(df)
+    
+    # The busiest route is the worst case for the detail table
+    busiest = max(route_index.route_positions, key=lambda route_id: len(route_index.route_positions[route_id]))
+    route_data = route_index.with_labels(df.iloc[route_index.route_positions[busiest]])
+    columns = ['route', 'airline', 'min_charge2', 'rating', 'rating_category', 'direct_indirect']
+    
+    print(f"{'table':<28} {'rows':>9} {'payload (KB)':>13} {'server (ms)':>12}")
+    for label, frame, query, sort_by in (
+        ('route detail, all columns', route_data, '', None),
+        ('route detail, page', route_data, '', 'min_charge2'),
+        ('route detail, filtered page', route_data, 'direct', 'min_charge2'),
+        ('all bids, filtered page', df, 'LH', 'min_charge2'),
+    ):
+        start = time.perf_counter()
+        if label.endswith('all columns'):
+            page = frame
+        else:
+            rows = filter_sort_rows(frame, query, sort_by, columns=[col for col in columns if col in frame.columns])
+            page = rows.iloc[:args.page_size][[col for col in columns if col in frame.columns]]
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label:<28} {len(frame):>9,} {arrow_bytes(page) / 1024:>13.1f} {elapsed:>12.1f}")
+
+if __name__ == '__main__':
+    main()
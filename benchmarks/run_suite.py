@@ -0,0 +1,105 @@
+"""Headless benchmark suite for the pure-compute stages, emitted as JSON
+
+Usage: python benchmarks/run_suite.py [--sizes 10000 100000] [--repeat 3] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bid_data import (  # noqa: E402
+    RouteIndex,
+    compute_carrier_stats,
+    compute_route_summary,
+    compute_savings_ranking,
+    export_bytes,
+    load_bids,
+    resolve_colors,
+    write_export,
+)
+from synthetic import write_bid_workbook  # noqa: E402
+
+def measure(func, repeat):
+    """Run func repeat times and summarize wall-clock seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'min_s': min(times), 'median_s': statistics.median(times), 'repeat': repeat}
+
+def bench_size(n_rows, repeat, directory):
+    path = write_bid_workbook(os.path.join(directory, f'bids_{n_rows}.xlsx'), n_rows)
+    df = load_bids(path)
+    route_index = RouteIndex(df)
+    
+    # Exercise the busiest route, as the dashboard would for a hub lane
+    origin, destination = max(
+        route_index.route_ids, key=lambda route: len(route_index.route_positions[route_index.route_ids[route]])
+    )
+    route_data = route_index.with_labels(route_index.route_rows(df, origin, destination))
+    route_summary = compute_route_summary(df)
+    
+    stages = {
+        'load': measure(lambda: load_bids(path), repeat),
+        'color_mapping': measure(lambda: resolve_colors(df), repeat),
+        'route_index_build': measure(lambda: RouteIndex(df), repeat),
+        'route_filter': measure(
+            lambda: route_index.with_labels(route_index.route_rows(df, origin, destination)), repeat
+        ),
+        'carrier_aggregation': measure(lambda: compute_carrier_stats(df), repeat),
+        'route_summary': measure(lambda: compute_route_summary(df), repeat),
+        'savings_ranking': measure(lambda: compute_savings_ranking(route_summary), repeat),
+        'csv_export': measure(lambda: export_bytes(route_data, 'csv'), repeat),
+        'parquet_export': measure(lambda: export_bytes(route_data, 'parquet'), repeat),
+        'xlsx_export': measure(lambda: export_bytes(route_data, 'xlsx'), repeat),
+        'bulk_csv_export': measure(
+            lambda: write_export(df, os.path.join(directory, 'export.csv'), 'csv', query='LH'), repeat
+        ),
+    }
+    return {
+        'rows': n_rows,
+        'workbook_bytes': os.path.getsize(path),
+        'parsed_rows': len(df),
+        'routes': len(route_index.route_ids),
+        'stages': stages,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [bench_size(n_rows, args.repeat, tmp) for n_rows in args.sizes]
+    
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    payload = json.dumps(report, indent=2)
+    
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(payload + '\n')
+    else:
+        print(payload)
+
+if __name__ == '__main__':
+    main()
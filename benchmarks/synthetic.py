@@ -0,0 +1,131 @@
+"""Synthetic 'Airline Bids' workbooks matching the layout load_data expects
+
+Usage: python benchmarks/synthetic.py bids.xlsx [--rows 10000] [--seed 0] [--phantom-rows 0] [--phantom-columns 0]
+"""
+import random
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+
+# Template layout: headers on row 11, data from row 12, starting at column C
+HEADERS = [
+    'Commodity Group', 'TempControlled', 'Air Mode', 'Origin Airport', 'Destination Airport',
+    'Origin Country', 'Destinatin Country', 'Origin Region', 'Destination Region',
+    'Origin City', 'Destination City', 'Lane ID', 'Volume (kg)', 'Airline',
+    'Intention to Bid (Yes/No)', 'Direct / Indirect', 'Via', 'Currency',
+    'Min Charge', 'Min Charge2', 'Percentage', 'Numerical Rating', 'Column1',
+]
+
+AIRPORTS = [
+    ('JFK', 'US', 'AMER'), ('LAX', 'US', 'AMER'), ('ORD', 'US', 'AMER'), ('MIA', 'US', 'AMER'),
+    ('GRU', 'BR', 'AMER'), ('MEX', 'MX', 'AMER'), ('YYZ', 'CA', 'AMER'), ('LHR', 'GB', 'EMEA'),
+    ('FRA', 'DE', 'EMEA'), ('CDG', 'FR', 'EMEA'), ('AMS', 'NL', 'EMEA'), ('MAD', 'ES', 'EMEA'),
+    ('DXB', 'AE', 'EMEA'), ('JNB', 'ZA', 'EMEA'), ('HKG', 'HK', 'APAC'), ('SIN', 'SG', 'APAC'),
+    ('NRT', 'JP', 'APAC'), ('ICN', 'KR', 'APAC'), ('PVG', 'CN', 'APAC'), ('SYD', 'AU', 'APAC'),
+    ('BOM', 'IN', 'APAC'), ('BKK', 'TH', 'APAC'),
+]
+
+AIRLINES = [
+    'LH', 'AF', 'KL', 'BA', 'EK', 'QR', 'CX', 'SQ', 'TK', 'AA', 'DL', 'UA', 'NH', 'JL',
+    'KE', 'CA', 'LA', 'ET', 'EY', 'AC', 'QF', 'CV', 'FX', '5X', 'IB',
+]
+
+CATEGORIES = {1: 'Green', 2: 'Orange', 3: 'Red'}
+
+def bid_rows(n_rows, seed=0):
+    """Yield n_rows synthetic bid rows in template column order"""
+    rng = random.Random(seed)
+    for i in range(n_rows):
+        origin, destination = rng.sample(AIRPORTS, 2)
+        rate = round(rng.uniform(40, 900), 2)
+        rating = rng.choices((1, 2, 3), weights=(20, 50, 30))[0]
+        direct = rng.random() < 0.6
+        yield (
+            rng.choice(('General Cargo', 'Pharma', 'Perishables', 'Dangerous Goods')),
+            rng.choice(('Yes', 'No')),
+            rng.choice(('Standard', 'Express')),
+            origin[0], destination[0], origin[1], destination[1], origin[2], destination[2],
+            None, None, f'L{i:07d}', rng.randint(100, 5000),
+            rng.choice(AIRLINES),
+            'Yes',
+            'Direct' if direct else 'Indirect',
+            None if direct else rng.choice(AIRPORTS)[0],
+            'USD',
+            round(rate * 0.8, 2), rate, round(rng.random(), 4),
+            rating,
+            # Some bids only carry the numerical rating
+            CATEGORIES[rating] if rng.random() < 0.9 else None,
+        )
+
+def write_bid_workbook(path, n_rows, seed=0, phantom_rows=0, phantom_columns=0):
+    """Write a synthetic 'Airline Bids' workbook with n_rows data rows to path
+    
+    phantom_rows / phantom_columns add formatted-but-empty cells below and to the right of
+    the data, the way sheets that were styled down to row 1,048,576 look to a reader.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Airline Bids')
+    
+    def styled_blanks(count):
+        cells = []
+        for _ in range(count):
+            cell = WriteOnlyCell(sheet)
+            cell.number_format = '0.00'
+            cells.append(cell)
+        return cells
+    
+    tail = styled_blanks(phantom_columns)
+    for _ in range(10):
+        sheet.append([])
+    sheet.append([None, None] + HEADERS + tail)
+    for row in bid_rows(n_rows, seed=seed):
+        sheet.append([None, None, *row] + tail)
+    blank_row = styled_blanks(2 + len(HEADERS) + phantom_columns)
+    for _ in range(phantom_rows):
+        sheet.append(blank_row)
+    
+    workbook.save(path)
+    return path
+
+def bid_frame(n_rows, seed=0):
+    """Raw bid frame as read_bid_sheet returns it, without the Excel round trip"""
+    return pd.DataFrame.from_records(bid_rows(n_rows, seed=seed), columns=HEADERS)
+
+def revise_bid_frame(raw, n_changes, seed=1, airlines=None):
+    """Next bid round of a raw frame: n_changes re-priced bids, n_changes withdrawn and n_changes new ones
+    
+    airlines limits the revision to those carriers, the usual shape of a bid round update.
+    """
+    rng = random.Random(seed)
+    candidates = range(len(raw)) if airlines is None else list(np.flatnonzero(raw['Airline'].isin(airlines)))
+    positions = rng.sample(candidates, 2 * n_changes)
+    repriced, withdrawn = positions[:n_changes], positions[n_changes:]
+    
+    revised = raw.copy()
+    rate_column = revised.columns.get_loc('Min Charge2')
+    for position in repriced:
+        revised.iat[position, rate_column] = round(revised.iat[position, rate_column] * rng.uniform(0.8, 1.1), 2)
+    revised = revised.drop(index=revised.index[withdrawn])
+    
+    new_bids = bid_frame(n_changes, seed=seed + 1000)
+    if airlines is not None:
+        new_bids['Airline'] = [rng.choice(airlines) for _ in range(n_changes)]
+    return pd.concat([revised, new_bids], ignore_index=True)
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Write a synthetic 'Airline Bids' workbook")
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--phantom-rows', type=int, default=0)
+    parser.add_argument('--phantom-columns', type=int, default=0)
+    args = parser.parse_args()
+    
+    write_bid_workbook(
+        args.path, args.rows, seed=args.seed,
+        phantom_rows=args.phantom_rows, phantom_columns=args.phantom_columns
+    )
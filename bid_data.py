@@ -0,0 +1,1022 @@
+"""Streamlit-free parsing, cleaning, indexing and aggregation of airline bid workbooks"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from profiling import profile_records, profile_stage, start_profiling
+
+logger = logging.getLogger(__name__)
+
+# On-disk cache of parsed workbooks; bump CACHE_VERSION whenever the cleaned frame changes shape
+CACHE_DIR = os.environ.get(
+    'AIRLINE_DASHBOARD_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'airline_dashboard_cache')
+)
+CACHE_MAX_MB = int(os.environ.get('AIRLINE_DASHBOARD_CACHE_MB', '512'))
+CACHE_VERSION = 'v5'
+
+# Loaded datasets are shared in memory by every session viewing them, up to STORE_MAX_MB in total;
+# a dataset no session has read for STORE_IDLE_MINUTES is dropped
+STORE_MAX_MB = int(os.environ.get('AIRLINE_DASHBOARD_STORE_MB', '2048'))
+STORE_IDLE_MINUTES = float(os.environ.get('AIRLINE_DASHBOARD_IDLE_MINUTES', '30'))
+
+# The header row is located by name within the first HEADER_SCAN_ROWS rows (row 11 in the current template)
+HEADER_SCAN_ROWS = 50
+HEADER_SCAN_COLUMNS = 200
+# Parsing stops after this many consecutive rows without any key data (styled-but-empty rows)
+EMPTY_ROW_RUN = 1000
+KEY_COLUMNS = ('Origin Airport', 'Destination Airport', 'Airline')
+# Sheet rows read between progress reports
+PROGRESS_ROWS = 10_000
+
+FILE_FORMATS = {
+    '.xlsx': 'excel', '.xlsm': 'excel', '.xls': 'excel',
+    '.csv': 'csv',
+    '.parquet': 'parquet', '.pq': 'parquet',
+}
+
+class BidFileError(ValueError):
+    """An uploaded file doesn't contain a usable bid table"""
+
+class SheetNotFoundError(BidFileError):
+    """The workbook has no 'Airline Bids' sheet"""
+
+class MissingColumnsError(BidFileError):
+    """A bid file lacks the key columns, or the rate column every bid needs"""
+
+class HeaderNotFoundError(BidFileError):
+    """No row near the top of the sheet carries the key column headers"""
+
+class UnreadableFileError(BidFileError):
+    """The file is corrupt or not in the format its name or contents suggest"""
+
+def detect_format(name, source):
+    """File format from the extension, falling back to the leading magic bytes"""
+    file_format = FILE_FORMATS.get(os.path.splitext(name)[1].lower())
+    if file_format is not None:
+        return file_format
+    
+    if isinstance(source, bytes):
+        head = source[:4]
+    else:
+        with open(source, 'rb') as f:
+            head = f.read(4)
+    if head == b'PAR1':
+        return 'parquet'
+    if head.startswith(b'PK'):
+        return 'excel'
+    return 'csv'
+
+def locate_header(rows):
+    """Index of the header row and of its first non-empty column, matching known names from COLUMN_MAPPING"""
+    best = None
+    for row_index, row in enumerate(rows):
+        names = [value.strip() if isinstance(value, str) else value for value in row]
+        if not all(name in names for name in KEY_COLUMNS):
+            continue
+        
+        known = sum(name in COLUMN_MAPPING for name in names)
+        if best is None or known > best[0]:
+            first_column = next(i for i, value in enumerate(names) if value)
+            best = (known, row_index, first_column)
+    
+    if best is None:
+        raise HeaderNotFoundError(
+            f"No header row with {', '.join(KEY_COLUMNS)} in the first {HEADER_SCAN_ROWS} rows"
+        )
+    return best[1], best[2]
+
+def read_bid_sheet(source, progress=None):
+    """Stream the 'Airline Bids' sheet into a raw DataFrame, stopping where the real data ends
+    
+    progress, when given, is always called with three arguments, progress(stage, done, total): once with
+    0, 0 as the workbook opens, then every PROGRESS_ROWS sheet rows; total is the row count the sheet
+    reports, which includes any styled-but-empty rows.
+    """
+    # Heavy readers are imported on first use to keep cold start fast
+    import openpyxl
+    
+    if progress is not None:
+        progress('opening workbook', 0, 0)
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        if 'Airline Bids' not in workbook.sheetnames:
+            raise SheetNotFoundError("Sheet 'Airline Bids' not found in the Excel file")
+        
+        sheet = workbook['Airline Bids']
+        reported_rows = sheet.max_row
+        reported_columns = sheet.max_column
+        
+        # Find the header in a bounded window; formatted sheets often report thousands of styled columns
+        scan_columns = min(reported_columns or HEADER_SCAN_COLUMNS, HEADER_SCAN_COLUMNS)
+        head = list(sheet.iter_rows(max_row=HEADER_SCAN_ROWS, max_col=scan_columns, values_only=True))
+        header_index, first_column = locate_header(head)
+        
+        # Columns after the last named header are empty trailing columns
+        header_values = head[header_index]
+        last_column = max(i for i, value in enumerate(header_values) if value not in (None, ''))
+        headers = [
+            (value.strip() if isinstance(value, str) else value) or f'col_{first_column + i + 1}'
+            for i, value in enumerate(header_values[first_column:last_column + 1])
+        ]
+        
+        rows = sheet.iter_rows(
+            min_row=header_index + 2, min_col=first_column + 1, max_col=last_column + 1, values_only=True
+        )
+        
+        # Only keep rows that have data in key columns (Origin Airport, Destination Airport, Airline),
+        # and stop after a long run of rows with no key data at all
+        origin_pos, destination_pos, airline_pos = (headers.index(name) for name in KEY_COLUMNS)
+        data = []
+        empty_run = 0
+        row_number = last_data_row = header_index + 1
+        total_rows = max((reported_rows or 0) - row_number, 0)
+        for row_number, row in enumerate(rows, start=header_index + 2):
+            rows_read = row_number - header_index - 2
+            if progress is not None and rows_read % PROGRESS_ROWS == 0:
+                progress('parsing', rows_read, total_rows)
+            origin, destination, airline = row[origin_pos], row[destination_pos], row[airline_pos]
+            if origin or destination or airline:
+                empty_run = 0
+                last_data_row = row_number
+                if origin and destination and airline:
+                    data.append(row)
+            else:
+                empty_run += 1
+                if empty_run >= EMPTY_ROW_RUN:
+                    break
+    finally:
+        # Read-only workbooks keep the file handle open until closed
+        workbook.close()
+    
+    df = pd.DataFrame.from_records(data, columns=headers)
+    df.attrs['phantom_rows'] = max(reported_rows or 0, row_number) - last_data_row
+    df.attrs['empty_columns'] = max((reported_columns or 0) - (last_column + 1), 0)
+    if df.attrs['phantom_rows'] or df.attrs['empty_columns']:
+        logger.info(
+            "Skipped %d phantom rows and %d empty trailing columns in 'Airline Bids'",
+            df.attrs['phantom_rows'], df.attrs['empty_columns']
+        )
+    
+    return df
+
+def read_bid_table(source, file_format):
+    """Read a CSV or Parquet export of the bid table into a raw DataFrame"""
+    if file_format == 'parquet':
+        df = pd.read_parquet(source)
+    else:
+        df = pd.read_csv(source, engine='pyarrow')
+    
+    # Exports may carry the template headers or the standardized names
+    key_columns = [name if name in df.columns else COLUMN_MAPPING[name] for name in KEY_COLUMNS]
+    missing = [name for name in key_columns if name not in df.columns]
+    if missing:
+        raise MissingColumnsError(f"Missing key columns: {', '.join(missing)}")
+    
+    # Same row filter as the Excel reader, by name instead of position
+    has_keys = np.logical_and.reduce([df[name].notna() & (df[name] != '') for name in key_columns])
+    return df[has_keys].reset_index(drop=True)
+
+# Clean and standardize column names
+COLUMN_MAPPING = {
+    'Commodity Group': 'commodity_group',
+    'TempControlled': 'temp_controlled',
+    'Air Mode': 'air_mode',
+    'Origin Airport': 'origin_airport',
+    'Destination Airport': 'destination_airport',
+    'Origin Country': 'origin_country',
+    'Destinatin Country': 'destination_country',
+    'Origin Region': 'origin_region',
+    'Destination Region': 'destination_region',
+    'Airline': 'airline',
+    'Intention to Bid (Yes/No)': 'intention_to_bid',
+    'Direct / Indirect': 'direct_indirect',
+    'Via': 'via',
+    'Currency': 'currency',
+    'Min Charge': 'min_charge',
+    'Min Charge2': 'min_charge2',
+    'Percentage': 'percentage',
+    'Numerical Rating': 'rating',
+    'Column1': 'rating_category'  # This contains Green/Orange/Red
+}
+
+RATING_COLORS = {
+    'green': '#22c55e',  # Bright Green
+    'orange': '#f97316',  # Bright Orange
+    'red': '#ef4444',  # Bright Red
+}
+NUMERICAL_RATING_COLORS = {1: RATING_COLORS['green'], 2: RATING_COLORS['orange'], 3: RATING_COLORS['red']}
+UNKNOWN_COLOR = '#6b7280'  # Gray for unknown
+
+# Bids missing any of these are dropped, so a file without one of the columns has no usable bids
+REQUIRED_COLUMNS = ('origin_airport', 'destination_airport', 'airline', 'min_charge2')
+
+def resolve_colors(df, use_rating=True):
+    """Vectorized color lookup from rating_category, falling back to the numerical rating"""
+    colors = pd.Series(np.nan, index=df.index, dtype=object)
+    
+    # First try to use rating_category (Green/Red/Orange)
+    if 'rating_category' in df.columns:
+        categories = df['rating_category'].astype('string').str.strip().str.lower()
+        colors = categories.map(RATING_COLORS).astype(object)
+    
+    # If rating_category is not available, use numerical rating
+    if use_rating and 'rating' in df.columns:
+        colors = colors.fillna(df['rating'].map(NUMERICAL_RATING_COLORS))
+    
+    return colors.fillna(UNKNOWN_COLOR)
+
+def standardize_bids(df):
+    """Rename, type and filter a raw bid sheet, without the derived color and route columns"""
+    # Rename columns that exist in the DataFrame
+    for old_name, new_name in COLUMN_MAPPING.items():
+        if old_name in df.columns:
+            df = df.rename(columns={old_name: new_name})
+    
+    missing = [name for name in REQUIRED_COLUMNS if name not in df.columns]
+    if missing:
+        template_names = {new_name: old_name for old_name, new_name in COLUMN_MAPPING.items()}
+        raise MissingColumnsError(f"Missing required columns: {', '.join(template_names[name] for name in missing)}")
+    
+    # Convert numeric columns
+    numeric_columns = ['min_charge2', 'rating']
+    for col in numeric_columns:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Clean rating category
+    if 'rating_category' in df.columns:
+        df['rating_category'] = df['rating_category'].astype(str).str.strip()
+        df['rating_category'] = df['rating_category'].replace({'nan': 'Unknown', '': 'Unknown'})
+    
+    # Filter out rows with missing critical data
+    return df.dropna(subset=list(REQUIRED_COLUMNS))
+
+def clean_bid_data(df):
+    """Standardize a raw bid sheet and derive the route key and color columns"""
+    df = standardize_bids(df)
+    
+    # Create color mapping based on BOTH numerical rating AND rating_category
+    with profile_stage('color mapping'):
+        df['color'] = resolve_colors(df)
+    
+    df['route_id'] = route_ids(df)
+    
+    return df
+
+def route_ids(df):
+    """Integer route key; "ORIGIN → DESTINATION" labels live in the RouteIndex lookup table"""
+    return df.groupby(['origin_airport', 'destination_airport'], observed=True).ngroup()
+
+# Text columns with fewer distinct values than this share of rows are stored as category
+CATEGORY_MAX_RATIO = 0.5
+
+def compact_dtypes(df, columns=None):
+    """Store repetitive text as category and downcast numbers where lossless, recording the savings in df.attrs
+    
+    columns limits the work to those columns, for frames whose other columns are already compact.
+    """
+    before_bytes = int(df.memory_usage(deep=True).sum())
+    compacted = {}
+    changes = {}
+    
+    for col in df.columns:
+        series = df[col]
+        if columns is not None and col not in columns:
+            new_series = series
+        elif pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            new_series = series
+        elif pd.api.types.is_integer_dtype(series):
+            new_series = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            # Only narrow floats that survive the round trip exactly; rates rarely do
+            narrowed = series.astype(np.float32)
+            lossless = (narrowed.astype(series.dtype) == series) | series.isna()
+            new_series = narrowed if lossless.all() else series
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if series.nunique(dropna=False) <= len(series) * CATEGORY_MAX_RATIO:
+                new_series = series.astype('category')
+            else:
+                new_series = series
+        else:
+            new_series = series
+        
+        compacted[col] = new_series
+        if new_series.dtype != series.dtype:
+            changes[col] = [str(series.dtype), str(new_series.dtype)]
+    
+    df = pd.DataFrame(compacted, index=df.index)
+    df.attrs['memory_report'] = {
+        'before_bytes': before_bytes,
+        'after_bytes': int(df.memory_usage(deep=True).sum()),
+        'columns': changes,
+    }
+    return df
+
+def reader_errors(file_format):
+    """Exceptions the readers raise for corrupt or mislabelled files"""
+    # ValueError covers pyarrow's ArrowInvalid, pandas' ParserError and UnicodeDecodeError
+    errors = (zipfile.BadZipFile, EOFError, KeyError, OSError, ValueError)
+    if file_format == 'excel':
+        from openpyxl.utils.exceptions import InvalidFileException
+        errors += (InvalidFileException,)
+    return errors
+
+def read_bid_source(source, file_format, progress=None):
+    """Raw bid table from workbook, CSV or Parquet bytes or a path"""
+    reader_source = BytesIO(source) if isinstance(source, bytes) else source
+    try:
+        if file_format == 'excel':
+            return read_bid_sheet(reader_source, progress)
+        return read_bid_table(reader_source, file_format)
+    except BidFileError:
+        raise
+    except reader_errors(file_format) as e:
+        raise UnreadableFileError(f"Could not read the file as {file_format}: {e}") from e
+
+def parse_bid_file(name, source, progress=None):
+    """Parse and clean one bid file, reporting how long it took; runs in a worker process for multi-file loads"""
+    start = time.perf_counter()
+    file_format = detect_format(name, source)
+    try:
+        raw = read_bid_source(source, file_format, progress)
+        if progress is not None:
+            progress('cleaning', len(raw), len(raw))
+        df = clean_bid_data(raw)
+        error = None
+    except BidFileError as e:
+        df, error = None, str(e)
+    
+    report = {
+        'file': name,
+        'format': file_format,
+        'rows': 0 if df is None else len(df),
+        'phantom_rows': raw.attrs.get('phantom_rows', 0) if df is not None else 0,
+        'seconds': time.perf_counter() - start,
+        'error': error,
+    }
+    return report, df
+
+def load_bid_files(sources, frame_cache=None, cache_key=None, max_workers=None, progress=None):
+    """Parse, clean, combine and compact (name, bytes or path) bid files, reusing frame_cache when one is given
+    
+    progress, when given, is always called as progress(stage, done, total): with sheet rows while a single
+    workbook is parsed, with finished files while several are parsed, and with 0, 0 at each later stage.
+    """
+    use_cache = frame_cache is not None and cache_key is not None
+    notify = progress or (lambda stage, done, total: None)
+    
+    if use_cache:
+        notify('reading cache', 0, 0)
+        with profile_stage('frame cache read'):
+            df = frame_cache.get(cache_key)
+        if df is not None:
+            return df
+    
+    with profile_stage('parsing & cleaning'):
+        if len(sources) == 1:
+            results = [parse_bid_file(*sources[0], progress=progress)]
+        else:
+            # Spawned workers only import bid_data, not the Streamlit server they'd inherit with fork
+            max_workers = max_workers or min(len(sources), os.cpu_count() or 1)
+            notify('parsing files', 0, len(sources))
+            with ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(parse_bid_file, name, source) for name, source in sources]
+                for done, _ in enumerate(as_completed(futures), start=1):
+                    notify('parsing files', done, len(sources))
+                results = [future.result() for future in futures]
+    
+    reports = [report for report, _ in results]
+    frames = [frame.assign(source_file=report['file']) for report, frame in results if frame is not None]
+    if not frames:
+        raise BidFileError('; '.join(f"{report['file']}: {report['error']}" for report in reports))
+    
+    notify('combining', 0, 0)
+    with profile_stage('combining'):
+        df = pd.concat(frames, ignore_index=True)
+        if len(frames) > 1:
+            # Route ids are only consistent within one file
+            df['route_id'] = route_ids(df)
+    
+    notify('compacting', 0, 0)
+    with profile_stage('dtype compaction'):
+        df = compact_dtypes(df)
+    df.attrs['ingest_report'] = reports
+    
+    if use_cache:
+        notify('writing cache', 0, 0)
+        with profile_stage('frame cache write'):
+            frame_cache.put(cache_key, df)
+    
+    return df
+
+def load_bids(source, frame_cache=None, cache_key=None):
+    """Parse, clean and compact a single bid workbook, CSV or Parquet file"""
+    name = os.path.basename(source) if isinstance(source, str) else getattr(source, 'name', 'upload')
+    return load_bid_files([(name, source)], frame_cache, cache_key)
+
+class LoadJob:
+    """load_bid_files running on a background thread, with its latest progress report readable from any thread
+    
+    With on_done, the loaded frame is handed to it on the load thread and the job keeps no reference to it,
+    so a load nobody collects doesn't hold the frame; otherwise it is kept as result. Its stage timings are
+    always recorded, since profiling is per thread, and kept as profile for the session that collects it.
+    """
+    
+    def __init__(self, sources, frame_cache=None, cache_key=None, on_done=None):
+        self.stage = 'starting'
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.started = time.perf_counter()
+        self.finished = None
+        self.profile = []
+        self._thread = threading.Thread(
+            target=self._run, args=(sources, frame_cache, cache_key, on_done), name='bid-load', daemon=True
+        )
+        self._thread.start()
+    
+    def _progress(self, stage, done, total):
+        self.stage, self.done, self.total = stage, done, total
+    
+    def _run(self, sources, frame_cache, cache_key, on_done):
+        start_profiling(True)
+        try:
+            with profile_stage('background load'):
+                result = load_bid_files(sources, frame_cache, cache_key, progress=self._progress)
+            if on_done is not None:
+                on_done(result)
+            else:
+                self.result = result
+        except Exception as e:
+            self.error = e
+        finally:
+            self.profile = [record for record in profile_records() if record['ms'] is not None]
+            self.stage = 'done'
+            self.finished = time.time()
+    
+    @property
+    def running(self):
+        return self._thread.is_alive()
+    
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+    
+    def wait(self, timeout=None):
+        """Block until the load finishes or timeout seconds pass; True when it has finished"""
+        self._thread.join(timeout)
+        return not self.running
+
+class DatasetEntry:
+    """One loaded dataset in a DatasetRegistry, with its memory footprint and who has read it"""
+    
+    def __init__(self, df):
+        self.df = df
+        self.nbytes = int(df.memory_usage(deep=True).sum())
+        self.created = self.last_access = time.time()
+        self.readers = {}
+
+class DatasetRegistry:
+    """Thread-safe in-memory store of loaded datasets, shared by every session that views them
+    
+    Frames are handed out as is rather than copied, so readers must treat them as read-only; under
+    copy-on-write, the only mode in pandas 3 (hence the pin in requirements.txt), frames derived from
+    them never write back. Datasets nobody has read for idle_seconds are dropped, as are the least
+    recently read once the total passes max_bytes.
+    """
+    
+    def __init__(self, max_bytes, idle_seconds):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def get(self, key, reader=None):
+        """The entry for key, recording reader's access, or None when it isn't loaded"""
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_access = time.time()
+                if reader is not None:
+                    entry.readers[reader] = entry.last_access
+            return entry
+    
+    def put(self, key, df, reader=None):
+        entry = DatasetEntry(df)
+        if reader is not None:
+            entry.readers[reader] = entry.last_access
+        with self._lock:
+            self._entries[key] = entry
+            self._evict_idle()
+            # Least recently read first; the dataset just added always stays
+            for old_key in sorted(self._entries, key=lambda k: self._entries[k].last_access):
+                if self.size_bytes() <= self.max_bytes or old_key == key:
+                    break
+                del self._entries[old_key]
+        return entry
+    
+    def size_bytes(self):
+        return sum(entry.nbytes for entry in self._entries.values())
+    
+    def _evict_idle(self):
+        cutoff = time.time() - self.idle_seconds
+        for key in [key for key, entry in self._entries.items() if entry.last_access < cutoff]:
+            del self._entries[key]
+        # Sessions that stopped reading no longer count as readers
+        for entry in self._entries.values():
+            entry.readers = {reader: last for reader, last in entry.readers.items() if last >= cutoff}
+    
+    def usage(self, reader=None):
+        """Per-dataset rows, bytes, active readers and idle seconds, most recently read first
+        
+        With a reader, only the datasets that reader is currently reading are listed.
+        """
+        with self._lock:
+            self._evict_idle()
+            now = time.time()
+            return [
+                {
+                    'key': key,
+                    'rows': len(entry.df),
+                    'bytes': entry.nbytes,
+                    'readers': len(entry.readers),
+                    'idle_seconds': now - entry.last_access,
+                }
+                for key, entry in sorted(self._entries.items(), key=lambda item: -item[1].last_access)
+                if reader is None or reader in entry.readers
+            ]
+
+# A bid is the same bid across revisions when these match; repeated keys pair up in file order
+ROW_KEY = ('airline', 'origin_airport', 'destination_airport', 'commodity_group', 'air_mode')
+# A matched bid counts as changed when any of these differ
+REVISION_COLUMNS = ('min_charge', 'min_charge2', 'rating', 'rating_category')
+# At most this many bids of each kind of change are listed
+REVISION_REPORT_ROWS = 500
+
+BidDelta = namedtuple('BidDelta', [
+    'unchanged_previous', 'unchanged_current', 'changed_previous', 'changed_current', 'added', 'removed'
+])
+
+def _comparable(df, columns):
+    """Columns cast so frames with different numeric widths hash alike; text hashes the same as category or string"""
+    return pd.DataFrame({
+        col: df[col].astype('float64') if pd.api.types.is_numeric_dtype(df[col]) else df[col]
+        for col in columns
+    })
+
+def _row_hashes(df, key, values):
+    """Unique row identities (key hash plus occurrence number) and value hashes"""
+    key_hash = pd.util.hash_pandas_object(_comparable(df, key), index=False).to_numpy()
+    occurrence = pd.Series(key_hash).groupby(key_hash).cumcount().to_numpy(dtype=np.uint64)
+    # uint64 arithmetic wraps, which is fine for a hash
+    identity = key_hash + occurrence * np.uint64(0x9E3779B97F4A7C15)
+    return identity, pd.util.hash_pandas_object(_comparable(df, values), index=False).to_numpy()
+
+def diff_bids(previous, current):
+    """Match bids between two revisions by ROW_KEY and classify them, as row positions into each frame"""
+    key = [col for col in ROW_KEY if col in previous.columns and col in current.columns]
+    values = [col for col in REVISION_COLUMNS if col in previous.columns and col in current.columns]
+    
+    previous_identity, previous_values = _row_hashes(previous, key, values)
+    current_identity, current_values = _row_hashes(current, key, values)
+    
+    match = pd.Index(previous_identity).get_indexer(current_identity)
+    matched = match >= 0
+    current_positions = np.flatnonzero(matched)
+    previous_positions = match[matched]
+    same = previous_values[previous_positions] == current_values[current_positions]
+    kept = np.zeros(len(previous), dtype=bool)
+    kept[previous_positions] = True
+    
+    return BidDelta(
+        unchanged_previous=previous_positions[same],
+        unchanged_current=current_positions[same],
+        changed_previous=previous_positions[~same],
+        changed_current=current_positions[~same],
+        added=np.flatnonzero(~matched),
+        removed=np.flatnonzero(~kept),
+    )
+
+def revision_report(delta):
+    """Number of unchanged, changed, added and removed bids"""
+    return {
+        'unchanged': len(delta.unchanged_current),
+        'changed': len(delta.changed_current),
+        'added': len(delta.added),
+        'removed': len(delta.removed),
+    }
+
+def revision_changes(previous, current, delta, limit=REVISION_REPORT_ROWS):
+    """Changed, added and removed bids with their old and new rates, at most limit of each"""
+    key = [col for col in ROW_KEY if col in current.columns]
+    previous_rates = previous['min_charge2'].to_numpy(dtype=float)
+    current_rates = current['min_charge2'].to_numpy(dtype=float)
+    
+    parts = []
+    for change, rows, old_rates, new_rates in (
+        ('Changed', current.iloc[delta.changed_current[:limit]],
+         previous_rates[delta.changed_previous[:limit]], current_rates[delta.changed_current[:limit]]),
+        ('Added', current.iloc[delta.added[:limit]],
+         np.full(len(delta.added[:limit]), np.nan), current_rates[delta.added[:limit]]),
+        ('Removed', previous.iloc[delta.removed[:limit]],
+         previous_rates[delta.removed[:limit]], np.full(len(delta.removed[:limit]), np.nan)),
+    ):
+        parts.append(pd.DataFrame({
+            'change': change,
+            **{col: rows[col].astype(str).to_numpy() for col in key},
+            'previous_rate': old_rates,
+            'new_rate': new_rates,
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+def compare_revisions(previous, current):
+    """Change counts and the revision_changes listing between two loaded datasets"""
+    with profile_stage('revision diff'):
+        delta = diff_bids(previous, current)
+        return revision_report(delta), revision_changes(previous, current, delta)
+
+def compute_route_summary(df):
+    """Per-route carrier count, rate statistics, cheapest carrier and rating counts from one grouped aggregation"""
+    route_bids = pd.DataFrame({
+        'route_id': df['route_id'],
+        'airline': df['airline'],
+        'rate': df['min_charge2'],
+        'green': df['color'] == RATING_COLORS['green'],
+        'orange': df['color'] == RATING_COLORS['orange'],
+        'red': df['color'] == RATING_COLORS['red'],
+    })
+    
+    grouped = route_bids.groupby('route_id')
+    route_summary = grouped.agg(
+        carriers=('airline', 'nunique'),
+        total_bids=('rate', 'size'),
+        best_rate=('rate', 'min'),
+        avg_rate=('rate', 'mean'),
+        max_rate=('rate', 'max'),
+        green_bids=('green', 'sum'),
+        orange_bids=('orange', 'sum'),
+        red_bids=('red', 'sum'),
+    )
+    route_summary['price_spread'] = route_summary['max_rate'] - route_summary['best_rate']
+    
+    # Carriers of each route's cheapest and most expensive bids, the first ones on ties
+    for column, positions in (('best_airline', grouped['rate'].idxmin()), ('worst_airline', grouped['rate'].idxmax())):
+        bids = route_bids.loc[positions]
+        route_summary[column] = pd.Series(bids['airline'].astype(str).to_numpy(), index=bids['route_id'].to_numpy())
+    return route_summary
+
+# Annual impact assumes one shipment per route per week
+WEEKS_PER_YEAR = 52
+
+def compute_savings_ranking(route_summary):
+    """Routes with competing bids ranked by the saving from moving the highest bid to the cheapest carrier"""
+    routes = route_summary[route_summary['total_bids'] > 1]
+    ranking = pd.DataFrame({
+        'savings': routes['price_spread'],
+        'savings_pct': routes['price_spread'] / routes['max_rate'] * 100,
+        'annual_impact': routes['price_spread'] * WEEKS_PER_YEAR,
+        'best_airline': routes['best_airline'],
+        'best_rate': routes['best_rate'],
+        'worst_airline': routes['worst_airline'],
+        'max_rate': routes['max_rate'],
+        'carriers': routes['carriers'],
+    })
+    return ranking.sort_values('savings', ascending=False)
+
+# Points a WebGL scatter is given before it is downsampled
+SCATTER_POINT_LIMIT = 20_000
+
+def downsample_points(df, max_points=SCATTER_POINT_LIMIT, by='airline', value='min_charge2', seed=0):
+    """At most max_points rows of df, always keeping each group's lowest and highest value
+    
+    The rest are a seeded uniform sample, so the same dataset always plots the same points.
+    """
+    if len(df) <= max_points:
+        return df
+    
+    # Positional frame, so idxmin/idxmax give row positions whatever df's index is
+    points = pd.DataFrame({'group': df[by].to_numpy(), 'value': df[value].to_numpy()}).dropna()
+    grouped = points.groupby('group')['value']
+    extremes = np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+    rest = np.setdiff1d(np.arange(len(df)), extremes, assume_unique=True)
+    sampled = np.random.default_rng(seed).choice(rest, size=max(max_points - len(extremes), 0), replace=False)
+    return df.iloc[np.sort(np.concatenate([extremes, sampled]))]
+
+def compute_carrier_stats(df):
+    """Per-carrier rate, coverage and rating statistics from a single grouped aggregation"""
+    carrier_bids = pd.DataFrame({
+        'airline': df['airline'],
+        'rate': df['min_charge2'],
+        'route_id': df['route_id'],
+        'green': df['color'] == RATING_COLORS['green'],
+        'orange': df['color'] == RATING_COLORS['orange'],
+        'red': df['color'] == RATING_COLORS['red'],
+    })
+    
+    airline_stats = carrier_bids.groupby('airline', observed=True).agg(
+        avg_rate=('rate', 'mean'),
+        min_rate=('rate', 'min'),
+        median_rate=('rate', 'median'),
+        max_rate=('rate', 'max'),
+        routes_covered=('route_id', 'nunique'),
+        total_bids=('rate', 'size'),
+        green_bids=('green', 'sum'),
+        orange_bids=('orange', 'sum'),
+        red_bids=('red', 'sum'),
+    ).reset_index()
+    airline_stats['avg_rate'] = airline_stats['avg_rate'].round(2)
+    
+    # Sort by total bids
+    return airline_stats.sort_values('total_bids', ascending=False)
+
+def format_route(origin, destination):
+    return f"{origin} → {destination}"
+
+class RouteIndex:
+    """Row positions and display labels for every route, built once per dataset"""
+    
+    def __init__(self, df):
+        self.route_positions = df.groupby('route_id').indices
+        
+        # One representative row per route gives the route lookup table
+        route_ids = sorted(self.route_positions)
+        first_rows = df.iloc[[self.route_positions[route_id][0] for route_id in route_ids]]
+        endpoints = list(zip(first_rows['origin_airport'], first_rows['destination_airport']))
+        
+        self.route_ids = dict(zip(endpoints, route_ids))
+        self.labels = pd.Series(
+            [format_route(origin, destination) for origin, destination in endpoints],
+            index=pd.Index(route_ids, name='route_id'),
+            name='route'
+        )
+        
+        self.destinations = {}
+        for origin, destination in sorted(endpoints):
+            self.destinations.setdefault(origin, []).append(destination)
+        self.origins = list(self.destinations)
+    
+    def destinations_for(self, origin):
+        return self.destinations.get(origin, [])
+    
+    def route_rows(self, df, origin, destination):
+        """Slice of df for one route, without scanning the whole frame"""
+        route_id = self.route_ids.get((origin, destination))
+        if route_id is None:
+            return df.iloc[0:0]
+        return df.iloc[self.route_positions[route_id]]
+    
+    def with_labels(self, df):
+        """Copy of df with the route label column, for the rows actually rendered or exported"""
+        df = df.copy()
+        df['route'] = self.labels.reindex(df['route_id']).to_numpy()
+        return df
+
+def filter_sort_rows(df, query='', sort_by=None, ascending=True, columns=None):
+    """Rows whose text in any of columns contains query (case-insensitive), stably sorted by one column"""
+    if query:
+        mask = np.zeros(len(df), dtype=bool)
+        for col in columns if columns is not None else df.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Match the few categories instead of every row
+                categories = series.cat.categories
+                matching = categories[categories.astype(str).str.contains(query, case=False, regex=False)]
+                mask |= series.isin(matching).to_numpy()
+            elif pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series):
+                matches = series.astype('string').str.contains(query, case=False, regex=False)
+                mask |= matches.fillna(False).to_numpy(dtype=bool)
+        df = df[mask]
+    
+    if sort_by is not None:
+        df = df.sort_values(sort_by, ascending=ascending, kind='stable')
+    return df
+
+# Download formats: MIME type and file extension
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+}
+# Rows converted at a time when writing an export, so no whole-file string is ever built
+EXPORT_CHUNK_ROWS = 100_000
+# Data rows per Excel sheet (the format's limit, less the header); longer exports continue on further sheets
+EXCEL_SHEET_ROWS = 1_048_575
+EXPORT_CURRENCY_COLUMNS = ('min_charge', 'min_charge2')
+
+def iter_export_chunks(df, query='', columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Consecutive slices of df's columns, each filtered by query like filter_sort_rows"""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if columns is not None:
+            chunk = chunk[columns]
+        chunk = filter_sort_rows(chunk, query)
+        if len(chunk):
+            yield chunk
+
+def _write_csv(chunks, handle, columns):
+    header = True
+    for chunk in chunks:
+        chunk.to_csv(handle, index=False, header=header)
+        header = False
+    if header:
+        pd.DataFrame(columns=columns).to_csv(handle, index=False)
+
+def _write_parquet(chunks, handle, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(handle, table.schema)
+            else:
+                # Cast to the first chunk's schema; a chunk of all-missing values would otherwise infer null
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(pd.DataFrame(columns=columns), preserve_index=False), handle)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def _write_xlsx(chunks, handle, columns):
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+    
+    workbook = openpyxl.Workbook(write_only=True)
+    header_font = Font(bold=True, color='FFFFFF')
+    header_fill = PatternFill('solid', fgColor='1F2937')
+    rating_fills = {
+        name: PatternFill('solid', fgColor=color.lstrip('#')) for name, color in RATING_COLORS.items()
+    }
+    currency_positions = [columns.index(col) for col in EXPORT_CURRENCY_COLUMNS if col in columns]
+    rating_position = columns.index('rating_category') if 'rating_category' in columns else None
+    
+    def new_sheet():
+        title = 'Airline Bids' if not workbook.worksheets else f'Airline Bids {len(workbook.worksheets) + 1}'
+        sheet = workbook.create_sheet(title)
+        sheet.freeze_panes = 'A2'
+        sheet.auto_filter.ref = f'A1:{get_column_letter(max(len(columns), 1))}1'
+        for position, col in enumerate(columns, start=1):
+            sheet.column_dimensions[get_column_letter(position)].width = max(len(str(col)) + 4, 12)
+        header = []
+        for col in columns:
+            cell = WriteOnlyCell(sheet, value=str(col))
+            cell.font = header_font
+            cell.fill = header_fill
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+    
+    sheet = new_sheet()
+    sheet_rows = 0
+    for chunk in chunks:
+        # Plain Python values; categoricals and missing values become text and blanks
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if sheet_rows == EXCEL_SHEET_ROWS:
+                sheet = new_sheet()
+                sheet_rows = 0
+            row = list(row)
+            for position in currency_positions:
+                cell = WriteOnlyCell(sheet, value=row[position])
+                cell.number_format = '"$"#,##0.00'
+                row[position] = cell
+            if rating_position is not None:
+                fill = rating_fills.get(str(row[rating_position]).strip().lower())
+                if fill is not None:
+                    cell = WriteOnlyCell(sheet, value=row[rating_position])
+                    cell.fill = fill
+                    row[rating_position] = cell
+            sheet.append(row)
+            sheet_rows += 1
+    workbook.save(handle)
+
+def write_export(df, target, file_format, query='', columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write columns of df (all by default) to a path or binary file as CSV, Parquet or XLSX
+    
+    Only rows whose text contains query are kept, matched like filter_sort_rows. Rows are converted
+    chunk_rows at a time; XLSX exports get a styled header, currency formats and rating colors, and
+    spill onto further sheets past Excel's row limit.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {file_format!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    
+    columns = list(df.columns) if columns is None else list(columns)
+    chunks = iter_export_chunks(df, query, columns, chunk_rows)
+    handle = open(target, 'wb') if isinstance(target, (str, os.PathLike)) else target
+    try:
+        if file_format == 'csv':
+            _write_csv(chunks, handle, columns)
+        elif file_format == 'parquet':
+            _write_parquet(chunks, handle, columns)
+        else:
+            _write_xlsx(chunks, handle, columns)
+    finally:
+        if handle is not target:
+            handle.close()
+
+def export_bytes(df, file_format):
+    """Whole export of a small frame (one route) as bytes"""
+    buffer = BytesIO()
+    write_export(df, buffer, file_format)
+    return buffer.getvalue()
+
+def content_digest(data):
+    """Content hash used to key parsed workbooks"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+DatasetKey = namedtuple('DatasetKey', ['name', 'size', 'digest'])
+
+class ParsedFrameCache:
+    """Size-bounded on-disk LRU cache of cleaned bid frames stored as Arrow IPC files"""
+    
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{CACHE_VERSION}-{key}.arrow")
+    
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.arrow'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+    
+    def size_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+    
+    def get(self, key):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        
+        path = self._path(key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            self.misses += 1
+            return None
+        
+        # Touch the file so eviction sees it as recently used
+        os.utime(path)
+        self.hits += 1
+        return table.to_pandas()
+    
+    def put(self, key, df):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            # Uncompressed so reads can memory-map the file; the index is kept for identical frames
+            feather.write_feather(pa.Table.from_pandas(df), tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+        except (pa.ArrowException, OSError):
+            # Caching is best effort: columns with mixed types can't be written to Arrow
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+    
+    def evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
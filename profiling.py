@@ -0,0 +1,50 @@
+"""Per-stage wall-clock timings, shared by the dashboard and headless jobs"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Streamlit runs each session's script in its own thread, so timings are kept per thread
+_profile = threading.local()
+
+def start_profiling(enabled):
+    """Reset stage timings at the start of a rerun"""
+    _profile.enabled = enabled
+    _profile.records = []
+    _profile.depth = 0
+
+@contextmanager
+def profile_stage(name):
+    """Time the enclosed block as one stage of the current rerun"""
+    if not getattr(_profile, 'enabled', False):
+        yield
+        return
+    
+    record = {'stage': name, 'depth': _profile.depth, 'ms': None}
+    _profile.records.append(record)
+    _profile.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record['ms'] = (time.perf_counter() - start) * 1000
+        _profile.depth -= 1
+
+def profiled(name):
+    """Decorator form of profile_stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def profile_records():
+    return list(getattr(_profile, 'records', []))
+
+def add_profile_records(records):
+    """Add stages timed on another thread, such as a background load, nested at the current depth"""
+    if not getattr(_profile, 'enabled', False):
+        return
+    _profile.records.extend({**record, 'depth': record['depth'] + _profile.depth} for record in records)